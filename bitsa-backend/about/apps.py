@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AboutConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'about'
+
+    def ready(self):
+        from core import constants
+        from .models import Leadership
+
+        constants.choices_resource('leadership-positions', Leadership, 'position')
+        constants.choices_resource('leadership-types', Leadership, 'leadership_type')
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('about', '0002_unique_active_leadership_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leadership',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of image (see core.images)'),
+        ),
+    ]
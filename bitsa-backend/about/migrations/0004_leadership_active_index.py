@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('about', '0003_leadership_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leadership',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['leadership_type', 'order', 'name'], name='about_leadership_active_idx'),
+        ),
+    ]
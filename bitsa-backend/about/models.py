@@ -54,6 +54,12 @@ class Leadership(models.Model):
         validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'webp'])],
         help_text="Profile image"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized copies of image (see core.images)"
+    )
     leadership_type = models.CharField(
         max_length=10, 
         choices=LEADERSHIP_TYPE_CHOICES,
@@ -81,6 +87,14 @@ class Leadership(models.Model):
                 name='unique_active_leadership_position'
             )
         ]
+        indexes = [
+            # the public endpoints only ever list active leaders, in display order
+            models.Index(
+                fields=['leadership_type', 'order', 'name'],
+                condition=models.Q(is_active=True),
+                name='about_leadership_active_idx',
+            ),
+        ]
         
     def __str__(self):
         return f"{self.name} - {self.position}"
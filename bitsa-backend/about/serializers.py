@@ -1,11 +1,13 @@
 from rest_framework import serializers
+from core.serializers import ImageSrcsetField, SparseFieldsMixin
 from .models import Leadership
 
 
-class LeadershipSerializer(serializers.ModelSerializer):
+class LeadershipSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for BITSA Leadership model"""
     
     image_url = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField()
     
     class Meta:
         model = Leadership
@@ -17,6 +19,7 @@ class LeadershipSerializer(serializers.ModelSerializer):
             'student_id',
             'image',
             'image_url',
+            'image_srcset',
             'leadership_type',
             'is_active',
             'order',
@@ -53,10 +56,11 @@ class LeadershipSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class LeadershipListSerializer(serializers.ModelSerializer):
+class LeadershipListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for list views"""
     
     image_url = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField()
     
     class Meta:
         model = Leadership
@@ -66,6 +70,7 @@ class LeadershipListSerializer(serializers.ModelSerializer):
             'position',
             'student_id',
             'image_url',
+            'image_srcset',
             'leadership_type',
             'is_active',
         ]
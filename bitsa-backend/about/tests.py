@@ -1,3 +1,72 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core.testing import QueryPlanAssertionsMixin
+from .models import Leadership
+
+
+class LeadershipIndexTests(QueryPlanAssertionsMixin, TestCase):
+    def test_active_listing_uses_partial_index(self):
+        qs = Leadership.objects.filter(is_active=True).order_by('leadership_type', 'order', 'name')
+        self.assertUsesIndex(qs, 'about_leadership_active_idx')
+
+
+class LeadershipResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Leadership.objects.create(name='Ada', position='PRESIDENT', leadership_type='student')
+
+    def test_anonymous_list_served_from_cache_until_leadership_changes(self):
+        first = self.client.get('/api/leadership/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/leadership/')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get('/api/leadership/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        # generations are bumped once the change commits
+        with self.captureOnCommitCallbacks(execute=True):
+            Leadership.objects.create(name='Grace', position='TREASURER', leadership_type='student')
+        self.assertEqual(len(self.client.get('/api/leadership/').json()), 2)
+
+    def test_cache_is_invalidated_only_when_the_change_commits(self):
+        self.client.get('/api/leadership/')
+        with self.captureOnCommitCallbacks() as callbacks:
+            Leadership.objects.create(name='Grace', position='TREASURER', leadership_type='student')
+            # a rollback must not leave a bumped generation behind
+            with self.assertNumQueries(0):
+                self.assertEqual(len(self.client.get('/api/leadership/').json()), 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(self.client.get('/api/leadership/').json()), 2)
+
+    def test_authenticated_and_other_queries_are_not_shared(self):
+        self.client.get('/api/leadership/')
+        with self.assertNumQueries(2):  # ETag aggregate + rows
+            self.client.get('/api/leadership/', {'type': 'top'})
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(self.client.get('/api/leadership/').status_code, 401)
+
+
+class LeadershipChoicesTests(TestCase):
+    def test_positions_and_types_keep_their_urls(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/leadership/positions/')
+        self.assertEqual(response.json(), dict(Leadership.POSITION_CHOICES))
+        self.assertEqual(self.client.get('/api/leadership/types/').json(), dict(Leadership.LEADERSHIP_TYPE_CHOICES))
+
+    def test_versioned_url_is_immutable_and_revalidates(self):
+        index = self.client.get('/api/constants/').json()
+        url = index['leadership-types']
+        response = self.client.get(url)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        stale = self.client.get('/api/constants/leadership-types/0000/')
+        self.assertRedirects(stale, url, fetch_redirect_response=False)
+        self.assertEqual(self.client.get('/api/constants/unknown/').status_code, 404)
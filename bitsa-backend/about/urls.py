@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from core.constants import constant_current
 from .views import LeadershipViewSet
 
 # Create router and register viewsets
@@ -9,6 +11,20 @@ router.register(r'leadership', LeadershipViewSet, basename='leadership')
 app_name = 'about'
 
 urlpatterns = [
+    # Choice lists are constant resources (see core.constants); these keep the
+    # original URLs working and must come before the router's detail route
+    path('api/leadership/positions/', constant_current, {'name': 'leadership-positions'}, name='leadership-positions'),
+    path('api/leadership/types/', constant_current, {'name': 'leadership-types'}, name='leadership-types'),
     # API endpoints will be registered via the router
     path('api/', include(router.urls)),
 ]
+
+if settings.ASYNC_VIEWS:
+    # async list, detail and stats ahead of the router (see core.async_views); writes fall through to the sync view
+    urlpatterns[:0] = [
+        path('api/leadership/', LeadershipViewSet.as_async_view({'get': 'list', 'post': 'create'}), name='leadership-list'),
+        path('api/leadership/stats/', LeadershipViewSet.as_async_view({'get': 'stats'}), name='leadership-stats'),
+        path('api/leadership/<int:pk>/', LeadershipViewSet.as_async_view({
+            'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+        }), name='leadership-detail'),
+    ]
@@ -3,11 +3,16 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from core.async_views import AsyncReadMixin
+from core.conditional import ConditionalGetMixin
+from core.metrics import SerializationTimingMixin
+from core.response_cache import AnonymousResponseCacheMixin
+from core.stats import aget_leadership_stats, get_leadership_stats, stats_response
 from .models import Leadership
 from .serializers import LeadershipSerializer, LeadershipListSerializer
 
 
-class LeadershipViewSet(viewsets.ModelViewSet):
+class LeadershipViewSet(AsyncReadMixin, AnonymousResponseCacheMixin, ConditionalGetMixin, SerializationTimingMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing BITSA leadership information
     
@@ -17,11 +22,15 @@ class LeadershipViewSet(viewsets.ModelViewSet):
     POST /api/leadership/ - Create new leader (admin only)
     PUT /api/leadership/{id}/ - Update leader (admin only)
     DELETE /api/leadership/{id}/ - Delete leader (admin only)
+
+    The positions/ and types/ choice lists are constant resources routed in
+    about/urls.py (see core.constants).
     """
     
 
     queryset = Leadership.objects.filter(is_active=True).order_by('leadership_type', 'order', 'name')
     permission_classes = [AllowAny]  # Allow public read access
+    cache_models = (Leadership,)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -51,41 +60,17 @@ class LeadershipViewSet(viewsets.ModelViewSet):
         
         return [permission() for permission in permission_classes]
     
-    @action(detail=False, methods=['get'])
-    def positions(self, request):
-        """
-        Get list of available positions
-        GET /api/leadership/positions/
-        """
-        positions = dict(Leadership.POSITION_CHOICES)
-        return Response(positions)
-    
-    @action(detail=False, methods=['get'])
-    def types(self, request):
-        """
-        Get list of leadership types
-        GET /api/leadership/types/
-        """
-        types = dict(Leadership.LEADERSHIP_TYPE_CHOICES)
-        return Response(types)
-    
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """
-        Get leadership statistics
+        Get leadership statistics (cached, see core.stats)
         GET /api/leadership/stats/
         """
-        total_leaders = Leadership.objects.filter(is_active=True).count()
-        top_leaders = Leadership.objects.filter(is_active=True, leadership_type='top').count()
-        student_leaders = Leadership.objects.filter(is_active=True, leadership_type='student').count()
-        
-        stats = {
-            'total_leaders': total_leaders,
-            'top_leaders': top_leaders,
-            'student_leaders': student_leaders,
-        }
-        
-        return Response(stats)
+        return stats_response(request, get_leadership_stats())
+
+    async def astats(self, request):
+        """stats() for the async route (see core.async_views)"""
+        return stats_response(request, await aget_leadership_stats())
     
     def create(self, request, *args, **kwargs):
         """Create new leader with validation"""
@@ -0,0 +1,105 @@
+"""
+JWT authentication without a user query on every request.
+
+``CachedJWTAuthentication`` resolves the token's user from the cache when it
+can. The fields views and permissions look at (id, username, email, names,
+is_active, is_staff, is_superuser) are cached until the token expires; the
+returned user is built with ``User.from_db`` from just those fields, so any
+other field is loaded on first access and ``save()`` only writes the cached
+fields back.
+
+Every ``User`` save or delete drops the entry (see accounts.signals), so
+blocking an account with ``toggle_user_block`` rejects its tokens on the
+next request. Changes made with ``QuerySet.update()`` send no signal; call
+``invalidate_user`` after them.
+
+That only holds when every worker shares the cache. With a per-process
+cache (``CACHE_BACKEND=locmem``) the other workers would keep their entries
+for the rest of the token's lifetime, so ``AUTH_USER_CACHE`` is off there
+and the user is loaded on every request.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+# in model field order, as Model.from_db() expects the values
+CACHED_FIELDS = ('id', 'is_superuser', 'username', 'first_name', 'last_name', 'email', 'is_staff', 'is_active')
+
+
+def _cache_key(user_id):
+    return f'accounts:auth-user:{user_id}'
+
+
+def invalidate_user(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+def _uncached():
+    # revocation is checked against the password hash, which is not cached
+    return api_settings.CHECK_REVOKE_TOKEN or not getattr(settings, 'AUTH_USER_CACHE', True)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if _uncached():
+            return super().get_user(validated_token)
+        user_id = self._user_id(validated_token)
+        key = _cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            values = self._user_values(user_id).first()
+            self._check_found(values)
+            cache.set(key, values, self._timeout(validated_token))
+        return self._user_from_values(values)
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views (see core.async_views)."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if _uncached():
+            return await sync_to_async(super().get_user)(validated_token)
+        user_id = self._user_id(validated_token)
+        key = _cache_key(user_id)
+        values = await cache.aget(key)
+        if values is None:
+            values = await self._user_values(user_id).afirst()
+            self._check_found(values)
+            await cache.aset(key, values, self._timeout(validated_token))
+        return self._user_from_values(values)
+
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+    def _user_values(self, user_id):
+        return self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(*CACHED_FIELDS)
+
+    def _check_found(self, values):
+        if values is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+
+    def _timeout(self, validated_token):
+        # keep it as long as this token can be presented
+        return max(int(validated_token.get('exp', 0) - time.time()), 1)
+
+    def _user_from_values(self, values):
+        user = self.user_model.from_db(DEFAULT_DB_ALIAS, CACHED_FIELDS, values)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2-SHA256 hasher with the work factor taken from
+    ``PASSWORD_HASH_ITERATIONS``. It keeps the ``pbkdf2_sha256`` algorithm
+    name, so existing hashes verify as before, and ``must_update`` makes
+    ``check_password`` re-hash a password at the configured cost the next
+    time its owner logs in.
+
+    The setting can only raise the cost: values below Django's default are
+    clamped to it. Tests lower the floor with ``PASSWORD_HASH_MIN_ITERATIONS``,
+    which is deliberately not read from the environment.
+    """
+
+    @property
+    def iterations(self):
+        floor = getattr(settings, 'PASSWORD_HASH_MIN_ITERATIONS', PBKDF2PasswordHasher.iterations)
+        return max(getattr(settings, 'PASSWORD_HASH_ITERATIONS', None) or 0, floor)
@@ -0,0 +1,58 @@
+import csv
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import provisioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Create accounts for a class list (CSV or JSON with first_name, last_name, email and "
+        "optional password) in one transaction. Generated passwords are written as CSV."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file to import')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Defaults to the file extension')
+        parser.add_argument('--workers', type=int, help='Hashing processes (default: USER_PROVISIONING_WORKERS)')
+        parser.add_argument('--output', help='Write generated email,password pairs here instead of stdout')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate the file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.lower().endswith('.csv') else 'json')
+        if not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+        with open(path, encoding='utf-8-sig', newline='') as handle:
+            try:
+                rows = provisioning.parse(handle.read(), fmt)
+            except (ValueError, csv.Error) as exc:
+                raise CommandError(str(exc))
+
+        result = provisioning.provision_users(rows, dry_run=options['dry_run'], workers=options['workers'])
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        if result['errors']:
+            raise CommandError(f"{len(result['errors'])} invalid row(s); no account was created.")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"All {len(rows)} row(s) are valid."))
+            return
+
+        generated = [user for user in result['users'] if 'password' in user]
+        if generated:
+            if options['output']:
+                with open(options['output'], 'w', newline='') as handle:
+                    self._write_passwords(handle, generated)
+                self.stdout.write(f"Generated passwords written to {options['output']}.")
+            else:
+                self._write_passwords(self.stdout, generated)
+        self.stdout.write(self.style.SUCCESS(f"Created {result['created']} account(s)."))
+
+    def _write_passwords(self, handle, users):
+        writer = csv.writer(handle)
+        writer.writerow(['email', 'password'])
+        for user in users:
+            writer.writerow([user['email'], user['password']])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = "Delete revoked refresh tokens that have expired anyway. Safe to run from cron at any interval."
+
+    def handle(self, *args, **options):
+        deleted = RevokedToken.sweep()
+        self.stdout.write(self.style.SUCCESS(f"Removed {deleted} expired revoked token(s)."))
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Functional index for the case-insensitive email lookup at login
+    (CustomTokenObtainPairSerializer.find_user). auth_user belongs to
+    django.contrib.auth, so the index is created with SQL rather than Meta.indexes.
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS accounts_user_email_lower_idx ON auth_user (LOWER(email))',
+            'DROP INDEX IF EXISTS accounts_user_email_lower_idx',
+        ),
+    ]
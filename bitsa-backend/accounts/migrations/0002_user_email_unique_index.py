@@ -0,0 +1,45 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.exclude(email='')
+        .values(email_lower=Lower('email'))
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .values_list('email_lower', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Cannot add the unique email index; merge or rename the accounts sharing these emails first: '
+            + ', '.join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Enforce case-insensitive email uniqueness in the database (registration
+    relies on it instead of a check-then-insert). Blank emails, as left by
+    createsuperuser, stay allowed. The predicate is written ``email > ''`` so
+    lookups filtering on ``email__gt=''`` match it on SQLite as well as
+    PostgreSQL. Replaces the plain index from 0001.
+    """
+
+    dependencies = [
+        ('accounts', '0001_user_email_lower_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            "CREATE UNIQUE INDEX IF NOT EXISTS accounts_user_email_lower_uniq ON auth_user (LOWER(email)) WHERE email > ''",
+            'DROP INDEX IF EXISTS accounts_user_email_lower_uniq',
+        ),
+        migrations.RunSQL(
+            'DROP INDEX IF EXISTS accounts_user_email_lower_idx',
+            'CREATE INDEX IF NOT EXISTS accounts_user_email_lower_idx ON auth_user (LOWER(email))',
+        ),
+    ]
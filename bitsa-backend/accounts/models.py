@@ -1,3 +1,23 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class RevokedToken(models.Model):
+    """
+    A refresh token that can no longer be used, because it was rotated or
+    logged out (see accounts.tokens). Only revoked tokens are stored, keyed by
+    their jti, and only until they would have expired anyway; the
+    ``sweep_revoked_tokens`` command deletes the rest.
+    """
+
+    jti = models.UUIDField(primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return str(self.jti)
+
+    @classmethod
+    def sweep(cls, now=None):
+        """Delete entries for tokens that have expired; returns how many."""
+        deleted, _ = cls.objects.filter(expires_at__lte=now or timezone.now()).delete()
+        return deleted
@@ -0,0 +1,174 @@
+"""
+Bulk user provisioning: create the accounts for a whole class list at once,
+used by the ``users/bulk/`` API endpoint and the ``provision_users``
+management command.
+
+A class list is CSV (or JSON) with ``first_name``, ``last_name``, ``email``
+and an optional ``password`` column; rows without a password get a random
+one, returned once so it can be handed out. Like self-registration, the
+email doubles as the username.
+
+The batch is validated as a whole: emails already taken (compared
+case-insensitively) are found in one query and every problem is reported
+by row number. Password hashing is deliberately slow, so for a full cohort
+the hashes are computed in a process pool (``USER_PROVISIONING_WORKERS``)
+before the users are inserted with ``bulk_create`` in one transaction.
+"""
+import csv
+import io
+import json
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from rest_framework import serializers
+
+from core import stats
+
+COLUMNS = ('first_name', 'last_name', 'email', 'password')
+BATCH_SIZE = 500
+# Below this many passwords starting worker processes costs more than it saves
+POOL_THRESHOLD = 8
+GENERATED_PASSWORD_BYTES = 9
+# Settings the worker processes need to hash exactly like this one
+HASH_SETTINGS = ('PASSWORD_HASHERS', 'PASSWORD_HASH_ITERATIONS', 'PASSWORD_HASH_MIN_ITERATIONS')
+
+
+class ProvisionUserSerializer(serializers.Serializer):
+    """One class-list row; the rules match RegisterSerializer."""
+
+    first_name = serializers.CharField(min_length=1, max_length=150)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    email = serializers.EmailField(max_length=150)
+    password = serializers.CharField(min_length=6, required=False)
+
+    def to_internal_value(self, data):
+        # CSV leaves an unused password column as an empty string
+        data = {key: value for key, value in data.items() if not (key == 'password' and value in ('', None))}
+        return super().to_internal_value(data)
+
+
+def parse(content, fmt):
+    """Rows (dicts) from CSV text or a JSON list / ``{"users": [...]}`` document."""
+    if fmt == 'csv':
+        return list(csv.DictReader(io.StringIO(content)))
+    data = json.loads(content) if isinstance(content, str) else content
+    if isinstance(data, dict):
+        data = data.get('users')
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise ValueError('Expected a JSON list of user objects.')
+    return data
+
+
+def validate_rows(rows):
+    """Return (validated rows, errors); errors are ``{'row': n, 'errors': {...}}``, 1-based."""
+    valid, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        serializer = ProvisionUserSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((number, dict(serializer.validated_data)))
+        else:
+            errors.append({'row': number, 'errors': serializer.errors})
+
+    # one query for every address already in use, as an email or as a username
+    emails = [row['email'] for _, row in valid]
+    conflicts = (
+        User.objects.alias(email_lower=Lower('email'))
+        .filter(Q(email_lower__in=[email.lower() for email in emails]) | Q(username__in=emails))
+        .values_list(Lower('email'), Lower('username'))
+    )
+    taken = {value for pair in conflicts for value in pair}
+    seen, rows_ok = set(), []
+    for number, row in valid:
+        email = row['email'].lower()
+        if email in taken:
+            errors.append({'row': number, 'errors': {'email': ['Email already exists']}})
+        elif email in seen:
+            errors.append({'row': number, 'errors': {'email': ['Email appears more than once in the list']}})
+        else:
+            seen.add(email)
+            rows_ok.append(row)
+    errors.sort(key=lambda error: error['row'])
+    return rows_ok, errors
+
+
+def _init_worker(hash_settings):
+    import django
+    from django.contrib.auth.hashers import get_hashers
+
+    django.setup()
+    # workers may be spawned fresh, so carry over the parent's (possibly overridden) hasher settings
+    for name, value in hash_settings.items():
+        setattr(settings, name, value)
+    get_hashers.cache_clear()
+
+
+def hash_passwords(passwords, workers=None):
+    """``make_password`` for each password, spread over worker processes for large batches."""
+    passwords = list(passwords)
+    if workers is None:
+        workers = getattr(settings, 'USER_PROVISIONING_WORKERS', None) or os.cpu_count() or 1
+    workers = min(workers, len(passwords))
+    if workers <= 1 or len(passwords) < POOL_THRESHOLD:
+        return [make_password(password) for password in passwords]
+
+    hash_settings = {name: getattr(settings, name) for name in HASH_SETTINGS if hasattr(settings, name)}
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(hash_settings,)) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def create_users(rows, workers=None):
+    """
+    Insert validated rows. Returns ``(users, generated)`` where ``generated``
+    maps the email of each user without a given password to its new password.
+    """
+    generated = {}
+    for row in rows:
+        if 'password' not in row:
+            row['password'] = generated[row['email']] = secrets.token_urlsafe(GENERATED_PASSWORD_BYTES)
+    hashes = hash_passwords((row['password'] for row in rows), workers=workers)
+
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            [
+                User(username=row['email'], email=row['email'], first_name=row['first_name'],
+                     last_name=row['last_name'], password=password)
+                for row, password in zip(rows, hashes)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+    # bulk_create sends no post_save, so the member count is not invalidated otherwise
+    stats.invalidate_platform_stats()
+    return users, generated
+
+
+def provision_users(rows, dry_run=False, workers=None):
+    """
+    Validate ``rows`` and, if all of them are valid and ``dry_run`` is off,
+    create the accounts. Returns ``{'created': n, 'users': [...], 'errors': [...]}``;
+    each user entry carries ``password`` only when it was generated.
+    """
+    valid, errors = validate_rows(rows)
+    if errors or dry_run:
+        return {'created': 0, 'users': [], 'errors': errors}
+    try:
+        users, generated = create_users(valid, workers=workers)
+    except IntegrityError:
+        # someone registered one of these emails since validation; nothing was saved
+        return {'created': 0, 'users': [], 'errors': [
+            {'row': None, 'errors': {'email': ['An email in the list was registered meanwhile; submit the list again.']}}
+        ]}
+    result = []
+    for user in users:
+        entry = {'id': user.pk, 'username': user.username, 'email': user.email}
+        if user.email in generated:
+            entry['password'] = generated[user.email]
+        result.append(entry)
+    return {'created': len(users), 'users': result, 'errors': []}
@@ -1,7 +1,16 @@
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer, TokenObtainPairSerializer, TokenRefreshSerializer, TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+from core.serializers import SparseFieldsMixin
+from .models import RevokedToken
+from .tokens import RevocableRefreshToken
 
 class RegisterSerializer(serializers.Serializer):
     first_name = serializers.CharField(min_length=1)
@@ -10,27 +19,27 @@ class RegisterSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True, min_length=6)
     password_confirm = serializers.CharField(write_only=True, min_length=6)
 
-    def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Email already exists")
-        return value
-
     def validate(self, data):
         if data["password"] != data["password_confirm"]:
             raise serializers.ValidationError({"password_confirm": "Passwords do not match"})
         return data
 
     def create(self, validated_data):
-        user = User.objects.create(
-            username=validated_data["email"],
-            email=validated_data["email"],
-            first_name=validated_data["first_name"],
-            last_name=validated_data.get("last_name", ""),
-            password=make_password(validated_data["password"]),
-        )
-        return user
-
-class UserSerializer(serializers.ModelSerializer):
+        # Uniqueness is enforced by the database (username, and LOWER(email) via
+        # accounts migration 0002): insert and report the conflict, no pre-check
+        try:
+            with transaction.atomic():
+                return User.objects.create(
+                    username=validated_data["email"],
+                    email=validated_data["email"],
+                    first_name=validated_data["first_name"],
+                    last_name=validated_data.get("last_name", ""),
+                    password=make_password(validated_data["password"]),
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({"email": ["Email already exists"]})
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     name = serializers.SerializerMethodField()
     role = serializers.SerializerMethodField()
 
@@ -49,25 +58,26 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     Accept username or email in the 'username' field.
     Lookup user by email or username and verify password with check_password()
     to avoid backend-dependent authenticate() pitfalls and MultipleObjectsReturned.
+    The lookup is a single query; emails match on LOWER(email), served by the
+    partial unique index from accounts migration 0002.
     """
+    token_class = RevocableRefreshToken
+
+    @staticmethod
+    def find_user(identifier):
+        if "@" in identifier:
+            # email provided — pick the first matching user to avoid MultipleObjectsReturned
+            users = User.objects.alias(email_lower=Lower('email')).filter(email_lower=identifier.lower())
+            return users.filter(email__gt='').order_by('id').first()
+        return User.objects.filter(username=identifier).first()
 
     def validate(self, attrs):
         identifier = attrs.get(self.username_field)  # typically 'username'
         password = attrs.get('password')
 
-        user = None
-        if identifier:
-            if "@" in identifier:
-                # email provided — pick the first matching user to avoid MultipleObjectsReturned
-                users_qs = User.objects.filter(email__iexact=identifier).order_by('id')
-                if users_qs.exists():
-                    user = users_qs.first()
-            else:
-                try:
-                    user = User.objects.get(username=identifier)
-                except User.DoesNotExist:
-                    user = None
+        user = self.find_user(identifier) if identifier else None
 
+        # check_password() also re-hashes the password when PASSWORD_HASH_ITERATIONS changed
         if user is None or not user.check_password(password):
             raise serializers.ValidationError('Invalid username/email or password', code='authorization')
 
@@ -92,3 +102,31 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         }
 
         return data
+
+
+class RefreshSerializer(TokenRefreshSerializer):
+    """Exchange a refresh token for a new access token (and, with rotation, a new refresh token)."""
+    token_class = RevocableRefreshToken
+
+    def validate(self, attrs):
+        try:
+            return super().validate(attrs)
+        except User.DoesNotExist:
+            # the account was deleted after the token was issued
+            raise exceptions.AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+
+class LogoutSerializer(TokenBlacklistSerializer):
+    """Revoke a refresh token."""
+    token_class = RevocableRefreshToken
+
+
+class VerifySerializer(TokenVerifySerializer):
+    """Check a token's signature and expiry; refresh tokens must also not be revoked."""
+
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        if token.get(api_settings.TOKEN_TYPE_CLAIM) == RevocableRefreshToken.token_type:
+            if RevokedToken.objects.filter(jti=token[api_settings.JTI_CLAIM]).exists():
+                raise serializers.ValidationError("Token is blacklisted")
+        return {}
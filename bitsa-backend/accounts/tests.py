@@ -1,3 +1,314 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from blogs.models import BlogPost
+from events.models import Event
+from . import provisioning
+from .authentication import CachedJWTAuthentication
+from .hashers import TunablePBKDF2PasswordHasher
+from .models import RevokedToken
+from .serializers import CustomTokenObtainPairSerializer
+from .throttling import LoginIdentifierThrottle
+
+
+class PlatformStatsTests(TestCase):
+    url = '/api/auth/stats/'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create(username='member')
+        Event.objects.create(title='Hack', description='Desc', organizer=self.user, start_time=timezone.now())
+        BlogPost.objects.create(title='Post', content='Body', author=self.user, is_published=True)
+
+    def test_stats_are_served_from_cache(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data, {'active_members': 1, 'annual_events': 1, 'projects': 1})
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_changes_invalidate_cached_stats(self):
+        self.client.get(self.url)
+        User.objects.create(username='newcomer')
+        BlogPost.objects.create(title='Draft', content='Body', author=self.user, is_published=True)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['active_members'], 2)
+        self.assertEqual(response.data['projects'], 2)
+
+    def test_admin_publish_actions_invalidate_cached_stats(self):
+        admin = User.objects.create_superuser(username='admin', password='x')
+        self.client.force_login(admin)
+        self.client.get(self.url)
+        post = BlogPost.objects.get()
+        self.client.post('/admin/blogs/blogpost/', {'action': 'make_unpublished', '_selected_action': [post.pk]})
+        self.assertEqual(self.client.get(self.url).data['projects'], 0)
+        self.client.post('/admin/blogs/blogpost/', {'action': 'make_published', '_selected_action': [post.pk]})
+        self.assertEqual(self.client.get(self.url).data['projects'], 1)
+
+    def test_conditional_get_returns_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertIn('max-age=60', response['Cache-Control'])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class LoginTests(TestCase):
+    url = '/api/auth/login/'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='ada', email='Ada@Example.com', password='correct-horse')
+
+    def test_email_login_is_case_insensitive_and_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, {'username': 'ada@example.COM', 'password': 'correct-horse'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user']['id'], self.user.pk)
+
+    def test_lookup_uses_lower_email_index(self):
+        qs = User.objects.alias(email_lower=Lower('email')).filter(email_lower='ada@example.com', email__gt='')
+        self.assertIn('accounts_user_email_lower_uniq', qs.explain())
+        self.assertEqual(CustomTokenObtainPairSerializer.find_user('ADA@example.com'), self.user)
+
+    @override_settings(PASSWORD_HASH_ITERATIONS=1000, PASSWORD_HASH_MIN_ITERATIONS=1000)
+    def test_password_rehashed_with_configured_iterations(self):
+        self.client.post(self.url, {'username': 'ada', 'password': 'correct-horse'})
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(self.user.check_password('correct-horse'))
+
+    @override_settings(PASSWORD_HASH_ITERATIONS=1000)
+    def test_iterations_are_not_lowered_below_django_default(self):
+        self.assertEqual(TunablePBKDF2PasswordHasher().iterations, PBKDF2PasswordHasher.iterations)
+        self.client.post(self.url, {'username': 'ada', 'password': 'correct-horse'})
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith(f'pbkdf2_sha256${PBKDF2PasswordHasher.iterations}$'))
+
+    def test_failed_logins_are_throttled_before_hashing(self):
+        for _ in range(5):
+            self.assertEqual(self.client.post(self.url, {'username': 'ada', 'password': 'wrong'}).status_code, 400)
+        with patch('django.contrib.auth.models.User.check_password') as check_password:
+            response = self.client.post(self.url, {'username': 'ada', 'password': 'correct-horse'})
+        self.assertEqual(response.status_code, 429)
+        check_password.assert_not_called()
+        # other accounts are unaffected; successful logins are never counted
+        User.objects.create_user(username='grace', password='pw-grace')
+        for _ in range(6):
+            self.assertEqual(self.client.post(self.url, {'username': 'grace', 'password': 'pw-grace'}).status_code, 200)
+
+
+    def test_parallel_attempts_cannot_exceed_the_limit(self):
+        # attempts are counted when admitted, before any of them has failed
+        request = Request(APIRequestFactory().post(self.url, {'username': 'ada'}, format='json'), parsers=[JSONParser()])
+        admitted = [LoginIdentifierThrottle().allow_request(request, None) for _ in range(6)]
+        self.assertEqual(admitted, [True] * 5 + [False])
+
+    def failed_logins_from(self, *forwarded_for, remote_addr='203.0.113.7'):
+        return [
+            self.client.post(
+                self.url, {'username': f'nobody{i}', 'password': 'wrong'},
+                REMOTE_ADDR=remote_addr, HTTP_X_FORWARDED_FOR=address,
+            ).status_code
+            for i, address in enumerate(forwarded_for)
+        ]
+
+    def test_spoofed_forwarded_for_does_not_reset_ip_limit(self):
+        statuses = self.failed_logins_from(*(f'198.51.100.{i}' for i in range(31)))
+        self.assertEqual(statuses[:30], [400] * 30)
+        self.assertEqual(statuses[30], 429)
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1})
+    def test_behind_a_proxy_only_the_address_it_appended_counts(self):
+        # the proxy appends the real client address to whatever the client sent
+        statuses = self.failed_logins_from(*(f'198.51.100.{i}, 192.0.2.1' for i in range(31)), remote_addr='10.0.0.2')
+        self.assertEqual(statuses[30], 429)
+        self.assertEqual(self.failed_logins_from('192.0.2.2', remote_addr='10.0.0.2'), [400])
+
+
+class RegistrationTests(TestCase):
+    url = '/api/auth/register/'
+
+    def setUp(self):
+        self.client = APIClient()
+        User.objects.create_user(username='ada@example.com', email='ada@example.com', password='correct-horse')
+
+    def payload(self, email):
+        return {'first_name': 'Ada', 'email': email, 'password': 'secret1', 'password_confirm': 'secret1'}
+
+    def test_duplicate_email_is_rejected_by_the_database(self):
+        # no exists() pre-check: just the insert, wrapped in a savepoint
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, self.payload('ADA@example.com'), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'email': ['Email already exists']})
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_email_uniqueness_is_case_insensitive_but_blank_is_allowed(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create(username='other', email='Ada@Example.COM')
+        User.objects.create(username='admin1')
+        User.objects.create(username='admin2')
+
+    def test_register(self):
+        response = self.client.post(self.url, self.payload('grace@example.com'), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('access', response.data)
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000, PASSWORD_HASH_MIN_ITERATIONS=1000)
+class ProvisioningTests(TestCase):
+    url = '/api/auth/users/bulk/'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True)
+        self.client.force_authenticate(self.admin)
+
+    def class_list(self, count):
+        lines = ['first_name,last_name,email,password']
+        lines += [f'Student,{i},student{i}@example.com,' for i in range(count)]
+        return '\n'.join(lines)
+
+    def test_csv_class_list_creates_accounts_with_generated_passwords(self):
+        response = self.client.generic('POST', self.url, self.class_list(3), content_type='text/csv')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 3)
+        entry = response.data['users'][0]
+        user = User.objects.get(pk=entry['id'])
+        self.assertEqual(user.username, 'student0@example.com')
+        self.assertTrue(user.check_password(entry['password']))
+
+    def test_invalid_rows_are_reported_and_nothing_is_created(self):
+        rows = [
+            {'first_name': 'A', 'email': 'ADMIN@example.com'},
+            {'first_name': 'B', 'email': 'b@example.com', 'password': 'secret1'},
+            {'first_name': 'C', 'email': 'B@example.com'},
+            {'first_name': '', 'email': 'not-an-email'},
+        ]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 3, 4])
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_given_passwords_are_kept_and_not_returned(self):
+        rows = [{'first_name': 'B', 'last_name': 'Lee', 'email': 'b@example.com', 'password': 'secret1'}]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('password', response.data['users'][0])
+        self.assertTrue(User.objects.get(email='b@example.com').check_password('secret1'))
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(User.objects.create_user(username='member'))
+        self.assertEqual(self.client.post(self.url, [], format='json').status_code, 403)
+
+    def test_process_pool_uses_the_configured_hasher(self):
+        hashes = provisioning.hash_passwords([f'password{i}' for i in range(8)], workers=2)
+        self.assertEqual(len(set(hashes)), 8)
+        self.assertTrue(all(value.startswith('pbkdf2_sha256$1000$') for value in hashes))
+        self.assertTrue(User(password=hashes[3]).check_password('password3'))
+
+
+@override_settings(AUTH_USER_CACHE=True)
+class CachedJWTAuthenticationTests(TestCase):
+    url = '/events/my-events/'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='pw', is_staff=True)
+        self.user = User.objects.create_user(username='ada', email='ada@example.com', password='correct-horse')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_user_is_only_queried_once_per_token_lifetime(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_blocked_user_is_rejected_immediately(self):
+        self.client.get(self.url)
+        admin_client = APIClient()
+        admin_client.force_authenticate(self.admin)
+        admin_client.patch(f'/api/auth/users/{self.user.pk}/toggle-block/')
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_staff_flag_change_is_picked_up(self):
+        self.assertEqual(self.client.get('/api/auth/users/').status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get('/api/auth/users/').status_code, 200)
+
+    def test_cached_user_saves_only_cached_fields(self):
+        self.client.get(self.url)
+        user = CachedJWTAuthentication().get_user(AccessToken.for_user(self.user))
+        user.first_name = 'Ada'
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Ada')
+        self.assertTrue(self.user.check_password('correct-horse'))
+
+    @override_settings(AUTH_USER_CACHE=False)
+    def test_block_from_another_worker_is_seen_without_a_shared_cache(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        # another worker's save() only clears that worker's per-process cache
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+class TokenLifecycleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='ada', password='correct-horse')
+        response = self.client.post('/api/auth/login/', {'username': 'ada', 'password': 'correct-horse'})
+        self.refresh = response.data['refresh']
+
+    def test_refresh_rotates_without_password_check(self):
+        with patch('django.contrib.auth.models.User.check_password') as check_password:
+            response = self.client.post('/api/auth/refresh/', {'refresh': self.refresh})
+        self.assertEqual(response.status_code, 200)
+        check_password.assert_not_called()
+        self.assertIn('access', response.data)
+        self.assertNotEqual(response.data['refresh'], self.refresh)
+
+        # the old refresh token is spent, the new one works
+        self.assertEqual(self.client.post('/api/auth/refresh/', {'refresh': self.refresh}).status_code, 401)
+        self.assertEqual(self.client.post('/api/auth/refresh/', {'refresh': response.data['refresh']}).status_code, 200)
+
+    def test_refresh_for_deleted_user_is_unauthorized(self):
+        self.user.delete()
+        response = self.client.post('/api/auth/refresh/', {'refresh': self.refresh})
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_revokes_refresh_token(self):
+        self.assertEqual(self.client.post('/api/auth/verify/', {'token': self.refresh}).status_code, 200)
+        self.assertEqual(self.client.post('/api/auth/logout/', {'refresh': self.refresh}).status_code, 200)
+        self.assertEqual(self.client.post('/api/auth/verify/', {'token': self.refresh}).status_code, 400)
+        self.assertEqual(self.client.post('/api/auth/refresh/', {'refresh': self.refresh}).status_code, 401)
+        self.assertEqual(self.client.post('/api/auth/logout/', {'refresh': self.refresh}).status_code, 401)
+
+    def test_sweep_removes_only_expired_entries(self):
+        self.client.post('/api/auth/logout/', {'refresh': self.refresh})
+        RevokedToken.objects.create(jti=uuid.uuid4(), expires_at=timezone.now() - timedelta(minutes=1))
+        out = StringIO()
+        call_command('sweep_revoked_tokens', stdout=out)
+        self.assertIn('Removed 1', out.getvalue())
+        self.assertEqual(RevokedToken.objects.count(), 1)
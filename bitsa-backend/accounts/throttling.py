@@ -0,0 +1,74 @@
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginFailureThrottle(SimpleRateThrottle):
+    """
+    Rate-limit failed logins. Unlike DRF's throttles only failures are
+    counted, so a crowd logging in successfully from one campus NAT is never
+    blocked, while a brute-force storm is rejected in ``initial()``, before
+    any password hash is computed.
+
+    The count is a cache counter per fixed window, raised atomically with
+    ``incr`` when an attempt is admitted and lowered again when it succeeds
+    (the view calls ``release``). Counting on admission rather than after
+    the password check means a parallel burst cannot slip past the limit
+    while its first attempts are still hashing.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            self.key = None
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        self.key = f'{key}:{window}'
+        if self._incr() > self.num_requests:
+            self.key = None  # rejected attempts never reach the view
+            return self.throttle_failure()
+        return True
+
+    def _incr(self):
+        self.cache.add(self.key, 0, self.duration)
+        try:
+            return self.cache.incr(self.key)
+        except ValueError:
+            # expired between add() and incr()
+            self.cache.add(self.key, 1, self.duration)
+            return 1
+
+    def release(self):
+        """Un-count an admitted attempt that succeeded."""
+        if getattr(self, 'key', None) is None:
+            return
+        try:
+            self.cache.decr(self.key)
+        except ValueError:
+            pass
+
+    def wait(self):
+        return max(self.window_end - self.timer(), 0)
+
+
+class LoginIPThrottle(LoginFailureThrottle):
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginIdentifierThrottle(LoginFailureThrottle):
+    scope = 'login_identifier'
+
+    def get_cache_key(self, request, view):
+        identifier = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not identifier:
+            return None
+        digest = hashlib.md5(str(identifier).strip().lower().encode(), usedforsecurity=False).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': digest}
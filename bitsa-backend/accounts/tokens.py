@@ -0,0 +1,48 @@
+"""
+Refresh tokens that can be revoked without simplejwt's ``token_blacklist``
+app. That app stores every token ever issued, with the full token text, and
+joins two tables to check one; here only revoked tokens are recorded, as a
+(jti, expires_at) row in ``RevokedToken``.
+
+``RevocableRefreshToken`` is what the login, refresh, verify and logout
+views use: ``verify()`` rejects revoked tokens and ``blacklist()`` revokes
+one, which is what the refresh view calls for the old token when
+``ROTATE_REFRESH_TOKENS`` and ``BLACKLIST_AFTER_ROTATION`` are on. Revoking
+is an insert on the primary key, so of two requests presenting the same
+refresh token only one can use it.
+"""
+from uuid import UUID
+
+from django.db import IntegrityError, transaction
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import RevokedToken
+
+
+class RevocableRefreshToken(RefreshToken):
+    @property
+    def jti(self):
+        return UUID(self.payload[api_settings.JTI_CLAIM])
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        self.check_blacklist()
+
+    def check_blacklist(self):
+        if RevokedToken.objects.filter(jti=self.jti).exists():
+            raise TokenError('Token is blacklisted')
+
+    def blacklist(self):
+        try:
+            with transaction.atomic():
+                return RevokedToken.objects.create(jti=self.jti, expires_at=datetime_from_epoch(self.payload['exp']))
+        except IntegrityError:
+            # revoked concurrently, e.g. the same token refreshed twice at once
+            raise TokenError('Token is blacklisted')
+
+    def outstand(self):
+        # issued tokens are not tracked, only revoked ones
+        return None
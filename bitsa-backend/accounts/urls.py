@@ -1,11 +1,16 @@
+from django.conf import settings
 from django.urls import path
-from .views import register, get_users, add_user, toggle_user_block, CustomTokenObtainPairView, stats
+from .views import register, get_users, add_user, bulk_add_users, toggle_user_block, CustomTokenObtainPairView, RefreshView, VerifyView, LogoutView, stats, astats
 
 urlpatterns = [
     path("register/", register, name="register"),
     path("login/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("stats/", stats, name="stats"),
+    path("refresh/", RefreshView.as_view(), name="token_refresh"),
+    path("verify/", VerifyView.as_view(), name="token_verify"),
+    path("logout/", LogoutView.as_view(), name="token_logout"),
+    path("stats/", astats if settings.ASYNC_VIEWS else stats, name="stats"),
     path("users/", get_users, name="get_users"),
     path("users/add/", add_user, name="add_user"),
+    path("users/bulk/", bulk_add_users, name="bulk_add_users"),
     path("users/<int:user_id>/toggle-block/", toggle_user_block, name="toggle_user_block"),
 ]
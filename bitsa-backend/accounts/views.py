@@ -1,38 +1,39 @@
 
+import csv
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenBlacklistView, TokenObtainPairView, TokenRefreshView, TokenVerifyView
 from django.contrib.auth.models import User
-from blogs.models import BlogPost
-from events.models import Event
-from gallery.models import Photo
-from .serializers import RegisterSerializer, UserSerializer, CustomTokenObtainPairSerializer
+from core.pagination import KeysetPagination
+from django.views.decorators.http import require_safe
+from core.async_views import render_now
+from core.stats import aget_platform_stats, get_platform_stats, stats_response
+from . import provisioning
+from .serializers import (
+    RegisterSerializer, UserSerializer, CustomTokenObtainPairSerializer, LogoutSerializer, RefreshSerializer,
+    VerifySerializer,
+)
+from .throttling import LoginIdentifierThrottle, LoginIPThrottle
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def stats(request):
     """
-    Get general stats for the platform
+    Get general stats for the platform (cached, see core.stats)
     """
-    # Active members: count of all users
-    active_members = User.objects.count()
-
-    # Annual events: count of events in the current year
-    from django.utils import timezone
-    current_year = timezone.now().year
-    annual_events = Event.objects.filter(start_time__year=current_year).count()
-
-    # Projects: count of published blog posts (assuming projects are documented as blog posts)
-    projects = BlogPost.objects.filter(is_published=True).count()
+    return stats_response(request, get_platform_stats())
 
-    return Response({
-        'active_members': active_members,
-        'annual_events': annual_events,
-        'projects': projects
-    })
+@require_safe
+async def astats(request):
+    """
+    stats() for ASGI deployments (see core.async_views): served from the
+    async cache, counted with the async ORM when the cache is cold
+    """
+    return render_now(stats_response(request, await aget_platform_stats()), request)
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -56,9 +57,39 @@ def register(request):
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     """
-    Custom token obtain pair view using CustomTokenObtainPairSerializer
+    Custom token obtain pair view using CustomTokenObtainPairSerializer.
+    Failed attempts are throttled per IP and per identifier (see accounts.throttling).
     """
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [LoginIPThrottle, LoginIdentifierThrottle]
+
+    def get_throttles(self):
+        # keep the instances so successful attempts can be released from them
+        self.throttles = super().get_throttles()
+        return self.throttles
+
+    def post(self, request, *args, **kwargs):
+        # every admitted attempt counts as a failure until it succeeds
+        response = super().post(request, *args, **kwargs)
+        for throttle in self.throttles:
+            throttle.release()
+        return response
+
+class RefreshView(TokenRefreshView):
+    """
+    POST {"refresh": ...} -> {"access": ..., "refresh": ...}
+    The refresh token is rotated: the one sent is revoked and a new one returned
+    (see accounts.tokens), so clients renew sessions without logging in again.
+    """
+    serializer_class = RefreshSerializer
+
+class VerifyView(TokenVerifyView):
+    """POST {"token": ...} -> 200 if the token is valid and not revoked, 401 otherwise."""
+    serializer_class = VerifySerializer
+
+class LogoutView(TokenBlacklistView):
+    """POST {"refresh": ...} -> revoke the refresh token (the access token expires on its own)."""
+    serializer_class = LogoutSerializer
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
@@ -66,8 +97,12 @@ def get_users(request):
     """
     Get all users (admin only)
     """
-    users = User.objects.all()
-    serializer = UserSerializer(users, many=True)
+    users = User.objects.order_by('id')
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(users, request)
+    if page is not None:
+        return paginator.get_paginated_response(UserSerializer(page, many=True, context={'request': request}).data)
+    serializer = UserSerializer(users, many=True, context={'request': request})
     return Response(serializer.data)
 
 @api_view(['POST'])
@@ -85,6 +120,36 @@ def add_user(request):
         }, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def bulk_add_users(request):
+    """
+    Create accounts for a whole class list (admin only, see accounts.provisioning).
+    POST /api/auth/users/bulk/[?dry_run=1] - a text/csv body, a JSON list or a "file" upload
+    with first_name, last_name, email and optional password columns; nothing is saved
+    unless every row is valid. Generated passwords are returned once.
+    """
+    try:
+        rows = _provisioning_rows(request)
+    except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true')
+    result = provisioning.provision_users(rows, dry_run=dry_run)
+    if result['errors']:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+def _provisioning_rows(request):
+    # text/csv has no DRF parser, so read the raw body before touching request.data
+    if request.content_type.startswith('text/csv'):
+        return provisioning.parse(request.body.decode('utf-8-sig'), 'csv')
+    upload = request.FILES.get('file')
+    if upload is not None:
+        fmt = 'csv' if upload.name.lower().endswith('.csv') else 'json'
+        return provisioning.parse(upload.read().decode('utf-8-sig'), fmt)
+    return provisioning.parse(request.data, 'json')
+
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def toggle_user_block(request, user_id):
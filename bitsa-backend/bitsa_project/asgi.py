@@ -0,0 +1,23 @@
+"""
+ASGI config for bitsa_project project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Serving through it also routes the busiest read endpoints to async views
+(``ASYNC_VIEWS``, see core.async_views) and turns off persistent database
+connections; set ``DB_POOL=True`` to reuse connections through a pool.
+Run it with an ASGI server, e.g.:
+
+    uvicorn bitsa_project.asgi:application --workers 4
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bitsa_project.settings')
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+
+application = get_asgi_application()
@@ -42,6 +42,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    # SearchVectorField / GinIndex (see core.search)
+    'django.contrib.postgres',
 
     # Third-party apps
     'rest_framework',
@@ -54,6 +56,7 @@ INSTALLED_APPS = [
     'blogs',
     'events',
     'about',
+    'core',
 ]
 
 
@@ -62,6 +65,8 @@ INSTALLED_APPS = [
 # ===========================
 
 MIDDLEWARE = [
+    # outermost so its timings include every other middleware (see core.metrics)
+    'core.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -112,9 +117,31 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Reuse a connection across requests for this many seconds (0 closes it
+        # after every request); health checks drop connections the server closed.
+        # Always 0 under ASGI, see below
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        },
     }
 }
 
+# Per-process connection pool (psycopg 3 with the "pool" extra). Replaces
+# persistent connections: Django requires CONN_MAX_AGE = 0 with a pool.
+# Under ASGI (bitsa_project.asgi sets ASYNC_VIEWS) queries run in
+# sync_to_async threads, where Django advises against persistent connections,
+# so there they are off as well; enable the pool to reuse connections.
+if os.getenv('DB_POOL', 'False') == 'True' or os.getenv('ASYNC_VIEWS', 'False') == 'True':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+if os.getenv('DB_POOL', 'False') == 'True':
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+    }
+
 
 # ===========================
 # PASSWORD VALIDATION
@@ -135,6 +162,21 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# PBKDF2 work factor (unset = Django's default; lower values are raised to it,
+# see accounts.hashers). Existing hashes are upgraded or downgraded
+# transparently the next time each user logs in.
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS')) if os.getenv('PASSWORD_HASH_ITERATIONS') else None
+
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Processes hashing passwords for bulk user provisioning (unset = one per CPU)
+USER_PROVISIONING_WORKERS = int(os.getenv('USER_PROVISIONING_WORKERS')) if os.getenv('USER_PROVISIONING_WORKERS') else None
 
 # ===========================
 # INTERNATIONALIZATION
@@ -156,6 +198,22 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# How files under MEDIA_URL are delivered (see core.media): 'python' streams
+# them from Django; 'x-accel-redirect' (nginx) and 'x-sendfile' (Apache,
+# lighttpd) hand them to the front proxy. Under ASGI 'python' reads every
+# chunk in a worker thread, so prefer an offload mode there
+MEDIA_DELIVERY = os.getenv('MEDIA_DELIVERY', 'python')
+# nginx `internal` location aliased to MEDIA_ROOT, for 'x-accel-redirect'
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '/protected-media/')
+# Browser cache lifetime of media whose names are not content-hashed
+MEDIA_CACHE_MAX_AGE = int(os.getenv('MEDIA_CACHE_MAX_AGE', '3600'))
+
+# Responsive variants generated for uploaded images (see core.images)
+IMAGE_VARIANT_WIDTHS = tuple(int(w) for w in os.getenv('IMAGE_VARIANT_WIDTHS', '320,640,1280').split(','))
+IMAGE_VARIANT_QUALITY = int(os.getenv('IMAGE_VARIANT_QUALITY', '80'))
+IMAGE_PIPELINE_WORKERS = int(os.getenv('IMAGE_PIPELINE_WORKERS', '2'))
+IMAGE_PIPELINE_SYNC = os.getenv('IMAGE_PIPELINE_SYNC', 'False') == 'True'
+
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -166,13 +224,95 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication with the user cached for the token's lifetime (AUTH_USER_CACHE)
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Keyset pagination; lists are paginated when the client sends ?page_size= or
+    # ?cursor=, or for every request once API_PAGE_SIZE is set.
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE')) if os.getenv('API_PAGE_SIZE') else None,
+    # Failed logins allowed per client IP / per username or email (see accounts.throttling)
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.getenv('LOGIN_THROTTLE_IP', '30/min'),
+        'login_identifier': os.getenv('LOGIN_THROTTLE_IDENTIFIER', '5/min'),
+    },
+    # Reverse proxies in front of the app. Throttles key clients on REMOTE_ADDR when 0,
+    # else on the address that many hops from the end of X-Forwarded-For; clients can
+    # forge the header, so it is never trusted as a whole.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
 
+# Upper bound for ?page_size=
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '100'))
+
+
+# ===========================
+# CACHE
+# ===========================
+
+# CACHE_BACKEND: 'locmem' (per process, the default), 'file' or 'redis'. Use a
+# shared backend when running several workers so invalidation reaches all of them.
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'bitsa'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://localhost:6379/1'),
+}
+_cache_backend, _cache_location = CACHE_BACKENDS[os.getenv('CACHE_BACKEND', 'locmem')]
+
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': os.getenv('CACHE_LOCATION', _cache_location),
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', '300')),
+        'KEY_PREFIX': 'bitsa',
+    }
+}
+
+# Cache the JWT user's fields (see accounts.authentication). A per-process
+# cache would keep blocked or deleted users authenticated on the other workers,
+# so this is off with locmem unless set explicitly (e.g. for a single worker).
+AUTH_USER_CACHE = os.getenv('AUTH_USER_CACHE', str(os.getenv('CACHE_BACKEND', 'locmem') != 'locmem')) == 'True'
+
+# Anonymous GET responses of the public endpoints (see core.response_cache)
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300'))
+
+
+# ===========================
+# REQUEST METRICS
+# ===========================
+
+# Query count/time, serialize/render time and size per request (see core.metrics)
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'True') == 'True'
+# Server-Timing response header; exposes query counts, so off by default in production
+REQUEST_METRICS_HEADER = os.getenv('REQUEST_METRICS_HEADER', str(DEBUG)) == 'True'
+# Warning thresholds
+SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', '500'))
+SLOW_REQUEST_QUERIES = int(os.getenv('SLOW_REQUEST_QUERIES', '50'))
+SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', '100'))
+# Password hashing (PBKDF2) makes these slow by design; only the query threshold applies
+SLOW_REQUEST_EXEMPT_VIEWS = ('token_obtain_pair', 'register', 'add_user', 'bulk_add_users')
+
+
+# ===========================
+# STATS
+# ===========================
+
+# Landing-page counters are cached until a relevant model changes (see core.stats)
+STATS_CACHE_TIMEOUT = int(os.getenv('STATS_CACHE_TIMEOUT', '3600'))
+STATS_MAX_AGE = int(os.getenv('STATS_MAX_AGE', '60'))
+
+
+# ===========================
+# SEARCH
+# ===========================
+
+# 'postgres' (tsvector + GIN), 'simple' (portable inverted index) or 'auto' to follow the DB vendor
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto')
+SEARCH_CONFIG = os.getenv('SEARCH_CONFIG', 'english')
+
 
 # ===========================
 # SIMPLE JWT CONFIG
@@ -182,7 +322,9 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
 
-    'ROTATE_REFRESH_TOKENS': False,
+    # /api/auth/refresh/ returns a new refresh token and revokes the old one
+    # (accounts.tokens); run sweep_revoked_tokens daily to prune expired entries
+    'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': False,
 
@@ -199,6 +341,16 @@ SIMPLE_JWT = {
 }
 
 
+# ===========================
+# ASGI
+# ===========================
+
+# Route the busiest read endpoints to async views (see core.async_views).
+# bitsa_project.asgi turns this on; under WSGI every async view would need
+# its own event loop, so it stays off there.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
+
 # ===========================
 # CORS
 # ===========================
@@ -18,13 +18,13 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
+from core.media import media_urlpatterns
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('accounts.urls')),
+    path('api/', include('core.urls')),
     path('gallery/', include('gallery.urls')),
     path('api/gallery/', include('gallery.urls')),
     path('blogs/', include('blogs.urls')),
@@ -34,6 +34,6 @@ urlpatterns = [
     path('', include('about.urls')),  # About app URLs
 ]
 
-# Serve media files from MEDIA_URL -> MEDIA_ROOT for testing environments.
-# NOTE: serving media via Django in production is not recommended; use a proper static/media server (nginx, S3, etc.)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Uploaded files under MEDIA_URL, streamed by Django or handed off to the
+# front proxy depending on MEDIA_DELIVERY (see core.media)
+urlpatterns += media_urlpatterns()
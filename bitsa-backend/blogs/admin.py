@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.db.models.functions import Now
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
+from core import stats
+from core.response_cache import bump_generation
 from .models import BlogPost
 
 @admin.register(BlogPost)
@@ -22,11 +25,18 @@ class BlogPostAdmin(admin.ModelAdmin):
     actions = ['make_published', 'make_unpublished']
 
     def make_published(self, request, queryset):
-        updated = queryset.filter(is_published=False).update(is_published=True, published_at=admin.utils.timezone.now())
+        updated = queryset.filter(is_published=False).update(
+            is_published=True, published_at=admin.utils.timezone.now(), updated_at=Now(),
+        )
+        # update() sends no post_save: refresh updated_at (ETags) and drop cached responses by hand
+        bump_generation(BlogPost._meta.label_lower)
+        stats.invalidate_platform_stats()
         self.message_user(request, f"{updated} post(s) marked as published.")
     make_published.short_description = "Mark selected posts as published"
 
     def make_unpublished(self, request, queryset):
-        updated = queryset.filter(is_published=True).update(is_published=False)
+        updated = queryset.filter(is_published=True).update(is_published=False, updated_at=Now())
+        bump_generation(BlogPost._meta.label_lower)
+        stats.invalidate_platform_stats()
         self.message_user(request, f"{updated} post(s) marked as unpublished.")
     make_unpublished.short_description = "Mark selected posts as unpublished"
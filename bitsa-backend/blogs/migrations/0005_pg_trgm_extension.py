@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:13
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def check_extension_privilege(apps, schema_editor):
+    """
+    Fail early, with instructions, when pg_trgm is missing and this role may
+    not install it. pg_trgm is a trusted extension (PostgreSQL 13+), so the
+    CREATE privilege on the database is enough; managed services often grant
+    neither that nor superuser to the application role.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone():
+            return
+        cursor.execute(
+            "SELECT rolsuper OR has_database_privilege(current_database(), 'CREATE') "
+            "FROM pg_roles WHERE rolname = current_user"
+        )
+        if not cursor.fetchone()[0]:
+            raise RuntimeError(
+                "The pg_trgm extension is not installed and the database role cannot install it. "
+                "Ask a database administrator to run CREATE EXTENSION pg_trgm; in this database, "
+                "then run the migrations again."
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0004_blogpost_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_extension_privilege, migrations.RunPython.noop),
+        # a no-op where the extension already exists (or off PostgreSQL)
+        TrigramExtension(),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:17
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+import core.migration_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0005_pg_trgm_extension'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', '-id'], name='blogs_published_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['author', '-created_at'], name='blogs_author_created_idx'),
+        ),
+        # case-insensitive category filters (category__iexact / __icontains)
+        core.migration_operations.AddPostgresIndex(
+            model_name='blogpost',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('category'), name='gin_trgm_ops'),
+                name='blogs_blogpost_category_trgm',
+            ),
+        ),
+    ]
@@ -1,7 +1,13 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 
 class BlogPost(models.Model):
+    # Fields indexed for ?search= with their ranking weight (see core.search)
+    SEARCH_FIELDS = {'title': 'A', 'excerpt': 'B', 'content': 'C'}
+
     title = models.CharField(max_length=200)
     content = models.TextField()
     excerpt = models.TextField(blank=True, help_text="Optional short summary")
@@ -11,12 +17,30 @@ class BlogPost(models.Model):
     read_time = models.PositiveIntegerField(default=5, help_text="Estimated read time in minutes")
     is_published = models.BooleanField(default=False)
     image = models.ImageField(upload_to='blogs/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of image (see core.images)")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
+    # PostgreSQL tsvector, GIN-indexed below and refreshed on save
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # public listing: published posts only, newest first
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_published=True),
+                name='blogs_published_created_idx',
+            ),
+            # ?author= listings
+            models.Index(fields=['author', '-created_at'], name='blogs_author_created_idx'),
+            # ?search= on PostgreSQL; created only there (see migrations)
+            GinIndex(fields=['search_vector'], name='blogs_blogpost_search_gin'),
+            # ?category= is a case-insensitive substring match (UPPER(...) LIKE
+            # '%...%'), which only a trigram index serves; PostgreSQL only
+            GinIndex(OpClass(Upper('category'), name='gin_trgm_ops'), name='blogs_blogpost_category_trgm'),
+        ]
 
     def __str__(self):
         return self.title
@@ -1,10 +1,12 @@
 from rest_framework import serializers
+from core.serializers import ImageSrcsetField, SparseFieldsMixin, absolute_url, auto_excerpt
 from .models import BlogPost
 
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
     author_email = serializers.CharField(source='author.email', read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField()
 
     def get_image_url(self, obj):
         if obj.image:
@@ -17,7 +19,7 @@ class BlogPostSerializer(serializers.ModelSerializer):
         model = BlogPost
         fields = [
             'id', 'title', 'content', 'excerpt', 'author', 'author_name', 'author_email',
-            'category', 'read_time', 'is_published', 'image', 'image_url', 'created_at',
+            'category', 'read_time', 'is_published', 'image', 'image_url', 'image_srcset', 'created_at',
             'updated_at', 'published_at'
         ]
         read_only_fields = ['id', 'author', 'created_at', 'updated_at', 'published_at']
@@ -25,3 +27,31 @@ class BlogPostSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data['author'] = self.context['request'].user
         return super().create(validated_data)
+
+
+class BlogPostListSerializer(BlogPostSerializer):
+    """
+    Compact serializer for list views: no ``content``, and ``excerpt`` falls
+    back to the start of the content (``content_preview``, annotated by the
+    view) when the author did not write one.
+    """
+
+    excerpt = serializers.SerializerMethodField()
+
+    class Meta(BlogPostSerializer.Meta):
+        fields = [
+            'id', 'title', 'excerpt', 'author', 'author_name', 'author_email',
+            'category', 'read_time', 'is_published', 'image', 'image_url', 'image_srcset',
+            'created_at', 'updated_at', 'published_at'
+        ]
+
+    def get_excerpt(self, obj):
+        if obj.excerpt:
+            return obj.excerpt
+        preview = getattr(obj, 'content_preview', None)
+        return auto_excerpt(obj.content if preview is None else preview)
+
+    def get_image_url(self, obj):
+        if obj.image:
+            return absolute_url(self.context.get('request'), obj.image.url)
+        return None
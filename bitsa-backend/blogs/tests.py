@@ -1,3 +1,70 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from core.testing import QueryPlanAssertionsMixin
+from .models import BlogPost
+
+
+class BlogPostViewSetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.author = User.objects.create(username='author')
+
+    def test_search_returns_published_matches_by_rank(self):
+        BlogPost.objects.create(title='Notes', content='Python tips for the python track', author=self.author, is_published=True)
+        BlogPost.objects.create(title='Python workshop', content='Slides', author=self.author, is_published=True)
+        BlogPost.objects.create(title='Python draft', content='Unpublished', author=self.author)
+        BlogPost.objects.create(title='Other', content='Nothing relevant', author=self.author, is_published=True)
+
+        response = self.client.get('/blogs/posts/', {'search': 'python'})
+        self.assertEqual([post['title'] for post in response.data], ['Python workshop', 'Notes'])
+
+    def test_list_omits_content_and_builds_excerpt(self):
+        post = BlogPost.objects.create(
+            title='Long read', content='<p>' + ' '.join(['word'] * 500) + '</p>',
+            author=self.author, is_published=True,
+        )
+        response = self.client.get('/blogs/posts/')
+        row = response.data[0]
+        self.assertNotIn('content', row)
+        self.assertTrue(row['excerpt'].startswith('word word'))
+        self.assertTrue(row['excerpt'].endswith('…'))
+
+        detail = self.client.get(f'/blogs/posts/{post.pk}/')
+        self.assertIn('content', detail.data)
+
+    def test_fields_param_limits_representation(self):
+        BlogPost.objects.create(title='Hello', excerpt='Hi', content='Body', author=self.author, is_published=True)
+        response = self.client.get('/blogs/posts/', {'fields': 'id,title,bogus'})
+        self.assertEqual(set(response.data[0]), {'id', 'title'})
+
+    def test_admin_publish_actions_change_etags(self):
+        post = BlogPost.objects.create(title='Draft', content='Body', author=self.author)
+        staff = User.objects.create_superuser(username='editor', password='x')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(staff)}')
+        self.client.force_login(staff)
+        url = f'/blogs/posts/{post.pk}/'
+        for action, published in (('make_published', True), ('make_unpublished', False)):
+            etag = self.client.get(url)['ETag']
+            self.client.post('/admin/blogs/blogpost/', {'action': action, '_selected_action': [post.pk]})
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['is_published'], published)
+
+
+class BlogPostIndexTests(QueryPlanAssertionsMixin, TestCase):
+    def setUp(self):
+        self.author = User.objects.create(username='author')
+        BlogPost.objects.create(title='Post', content='Body', author=self.author, is_published=True)
+
+    def test_published_listing_uses_partial_index(self):
+        qs = BlogPost.objects.filter(is_published=True).order_by('-created_at', '-id')
+        self.assertUsesIndex(qs, 'blogs_published_created_idx')
+
+    def test_author_filter_uses_composite_index(self):
+        qs = BlogPost.objects.filter(author=self.author).order_by('-created_at')
+        self.assertUsesIndex(qs, 'blogs_author_created_idx')
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
@@ -8,3 +9,12 @@ router.register(r'posts', views.BlogPostViewSet)
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+if settings.ASYNC_VIEWS:
+    # async list/detail ahead of the router (see core.async_views); writes fall through to the sync view
+    urlpatterns[:0] = [
+        path('posts/', views.BlogPostViewSet.as_async_view({'get': 'list', 'post': 'create'}), name='blogpost-list'),
+        path('posts/<int:pk>/', views.BlogPostViewSet.as_async_view({
+            'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+        }), name='blogpost-detail'),
+    ]
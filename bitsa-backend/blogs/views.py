@@ -2,9 +2,15 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db import models
+from core import search as core_search
+from core.async_views import AsyncReadMixin
+from core.conditional import ConditionalGetMixin
+from core.metrics import SerializationTimingMixin
+from core.response_cache import AnonymousResponseCacheMixin
 from .models import BlogPost
-from .serializers import BlogPostSerializer
+from django.db.models.functions import Substr
+from core.serializers import EXCERPT_SOURCE_CHARS
+from .serializers import BlogPostSerializer, BlogPostListSerializer
 
 class IsAuthorOrAdmin(permissions.BasePermission):
     """
@@ -19,9 +25,10 @@ class IsAuthorOrAdmin(permissions.BasePermission):
         # Write permissions are only allowed to the author or admin
         return obj.author == request.user or request.user.is_staff
 
-class BlogPostViewSet(viewsets.ModelViewSet):
+class BlogPostViewSet(AsyncReadMixin, AnonymousResponseCacheMixin, ConditionalGetMixin, SerializationTimingMixin, viewsets.ModelViewSet):
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
+    cache_models = (BlogPost,)
 
     def get_permissions(self):
         """
@@ -31,8 +38,18 @@ class BlogPostViewSet(viewsets.ModelViewSet):
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated(), IsAuthorOrAdmin()]
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return BlogPostListSerializer
+        return BlogPostSerializer
+
     def get_queryset(self):
-        queryset = BlogPost.objects.all()
+        queryset = BlogPost.objects.select_related('author')
+        if self.action == 'list':
+            # list rows only need the start of the content for auto excerpts
+            queryset = queryset.defer('content').annotate(
+                content_preview=Substr('content', 1, EXCERPT_SOURCE_CHARS)
+            )
 
         # For list/retrieve actions, only show published posts to non-authenticated users
         if self.action in ['list', 'retrieve'] and not self.request.user.is_authenticated:
@@ -51,14 +68,10 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         if category is not None:
             queryset = queryset.filter(category__icontains=category)
 
-        # Search by title or content
-        search = self.request.query_params.get('search', None)
-        if search is not None:
-            queryset = queryset.filter(
-                models.Q(title__icontains=search) |
-                models.Q(content__icontains=search) |
-                models.Q(excerpt__icontains=search)
-            )
+        # Full-text search over title, excerpt and content, best matches first
+        search = self.request.query_params.get('search', '').strip()
+        if search:
+            return core_search.search(queryset, search).order_by('-search_rank', '-created_at')
 
         return queryset.order_by('-created_at')
 
@@ -0,0 +1,242 @@
+"""
+Async read paths for ASGI deployments.
+
+Under ``bitsa_project.asgi`` (``ASYNC_VIEWS`` on) the busiest public GET
+endpoints are served by async views, so a request waiting on the cache or
+the database does not hold a worker thread while it waits. Event launches
+bring bursts of exactly these requests.
+
+``AsyncReadMixin`` gives an existing DRF view class ``as_async_view()``.
+The async path reuses the view's own ``get_queryset()``, permissions,
+serializers and pagination and only swaps the I/O for async equivalents:
+
+* JWT users are resolved with ``CachedJWTAuthentication.aauthenticate``;
+* anonymous responses are read from and written to the shared response
+  cache (see core.response_cache) with the async cache API;
+* ETag aggregates (see core.conditional), objects and pages are fetched
+  with the async ORM.
+
+Every other method on the same URL (writes, OPTIONS) is handed to the
+regular sync view. Requests using one of ``sync_queryset_params`` build
+their queryset in a worker thread, because building it runs a query
+(``?search=`` looks up a ContentType).
+
+Serializers run on the event loop, so the querysets they are given must
+already join or prefetch whatever they read; a lazy relation raises
+SynchronousOnlyOperation instead of quietly adding a query per row.
+
+Under ASGI Django consumes a streaming response's sync iterator with
+``sync_to_async(list)``: the whole body is built in memory before the first
+byte goes out. ``streaming_content()`` hands such responses (media, exports)
+an async iterator instead, which pulls one chunk at a time from a thread.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSetMixin
+
+from .conditional import ConditionalGetMixin
+from .response_cache import AnonymousResponseCacheMixin, _timeout
+
+READ_METHODS = ('GET', 'HEAD')
+_EXHAUSTED = object()
+
+
+class RenderedResponse(HttpResponse):
+    """A DRF response after rendering; keeps ``data`` for whatever inspects it."""
+
+    def __init__(self, response):
+        super().__init__(response.content, status=response.status_code, headers=response.headers)
+        self.data = response.data
+
+
+def render_now(response, request=None):
+    """
+    Render a DRF response on the event loop and return it as a plain
+    HttpResponse; Django would otherwise render it on its sync thread,
+    which every async request shares.
+    """
+    if not hasattr(response, 'render'):
+        return response
+    if getattr(response, 'accepted_renderer', None) is None:
+        # returned outside a DRF view (see accounts.views.astats)
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = JSONRenderer.media_type
+        response.renderer_context = {}
+    start = time.perf_counter()
+    response.render()
+    metrics = getattr(request, '_request_metrics', None)
+    if metrics is not None:
+        metrics.render_ms = (time.perf_counter() - start) * 1000
+    return RenderedResponse(response)
+
+
+def is_asgi(request):
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def streaming_content(request, iterator, thread_sensitive=True):
+    """
+    ``iterator`` as the content of a StreamingHttpResponse for ``request``:
+    unchanged under WSGI, an async iterator over it under ASGI. Iterators
+    that query the database need ``thread_sensitive`` (the request's
+    connection belongs to its sync thread); file reads can run on any thread.
+    """
+    if not is_asgi(request):
+        return iterator
+    return _aiterate(iter(iterator), thread_sensitive)
+
+
+async def _aiterate(iterator, thread_sensitive):
+    step = sync_to_async(next, thread_sensitive=thread_sensitive)
+    try:
+        while (item := await step(iterator, _EXHAUSTED)) is not _EXHAUSTED:
+            yield item
+    finally:
+        # a client that disconnects mid-stream must not leave a file or cursor open
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=thread_sensitive)()
+
+
+class AsyncReadMixin:
+    # query params whose filters run a query while the queryset is built
+    sync_queryset_params = ('search',)
+
+    @classmethod
+    def as_async_view(cls, actions, **initkwargs):
+        """
+        ``actions`` maps HTTP methods to actions as for ``ViewSet.as_view()``;
+        GET and HEAD run ``a<action>()`` on the event loop and the other
+        methods go to the sync view. Generic views take the same mapping
+        (``{'get': 'list', 'post': 'create'}``).
+        """
+        is_viewset = issubclass(cls, ViewSetMixin)
+        sync_view = sync_to_async(cls.as_view(actions, **initkwargs) if is_viewset else cls.as_view(**initkwargs))
+        read_action = actions['get']
+
+        async def view(request, *args, **kwargs):
+            if request.method not in READ_METHODS:
+                return await sync_view(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            if is_viewset:
+                self.action_map = {'get': read_action, 'head': read_action}
+            self.setup(request, *args, **kwargs)
+            return await self.adispatch(request, read_action, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        # DRF views handle CSRF through their authentication classes
+        view.csrf_exempt = True
+        return view
+
+    async def adispatch(self, request, action, *args, **kwargs):
+        """dispatch() for one read action, with the response cache in front as in the sync view."""
+        self.action = action
+        cache_key = None
+        if isinstance(self, AnonymousResponseCacheMixin):
+            cache_key = await self.aget_response_cache_key(request)
+            if cache_key is not None:
+                entry = await cache.aget(cache_key)
+                if entry is not None:
+                    return self._cached_response(request, entry)
+
+        self.args, self.kwargs = args, kwargs
+        drf_request = self.initialize_request(request, *args, **kwargs)
+        self.request = drf_request
+        self.headers = self.default_response_headers
+        try:
+            await self.aperform_authentication(drf_request)
+            self.initial(drf_request, *args, **kwargs)
+            response = await getattr(self, f'a{action}')(drf_request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(drf_request, response, *args, **kwargs)
+        response = render_now(self.response, request)
+
+        if cache_key is not None:
+            entry = self._cache_entry(response)
+            if entry is not None:
+                await cache.aset(cache_key, entry, _timeout())
+        return response
+
+    async def aperform_authentication(self, request):
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    result = await authenticator.aauthenticate(request)
+                else:
+                    result = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if result is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = result
+                return
+        request._not_authenticated()
+
+    async def aget_filtered_queryset(self):
+        queryset_built_with_query = any(self.request.query_params.get(name) for name in self.sync_queryset_params)
+        if queryset_built_with_query:
+            return await sync_to_async(self._filtered_queryset)()
+        return self._filtered_queryset()
+
+    def _filtered_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    async def aget_object(self):
+        queryset = await self.aget_filtered_queryset()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        if hasattr(self.paginator, 'apaginate_queryset'):
+            return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        return await sync_to_async(self.paginator.paginate_queryset)(queryset, self.request, view=self)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.aget_filtered_queryset()
+        etag = None
+        if isinstance(self, ConditionalGetMixin):
+            summary = await queryset.order_by().aaggregate(**self.list_summary_kwargs())
+            etag = self.list_etag(request, summary)
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return self._with_validators(not_modified, etag)
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        else:
+            rows = [row async for row in queryset]
+            response = Response(self.get_serializer(rows, many=True).data)
+        return self._with_validators(response, etag) if etag else response
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        if not isinstance(self, ConditionalGetMixin):
+            return Response(self.get_serializer(instance).data)
+
+        # unlike the sync retrieve(), the object loaded for the ETag is reused for the body
+        etag, last_modified = self.detail_validators(request, instance)
+        response = get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self._with_validators(response, etag, last_modified)
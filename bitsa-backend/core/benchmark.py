@@ -0,0 +1,275 @@
+"""
+Building blocks for the ``benchmark_api`` load test: live WSGI and ASGI
+servers for this project, a seeded data set, request scenarios and latency
+summaries. Requests are made with ``urllib`` from a thread pool, so the
+harness needs nothing beyond the standard library and the project itself
+(plus uvicorn for the ASGI server).
+"""
+import json
+import socket
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, WSGIServer
+from django.db import connections
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+PASSWORD = 'bench-password'
+
+
+def latency_summary(timings):
+    """min/mean/percentiles/max of a list of millisecond timings."""
+    if len(timings) < 2:
+        timings = timings * 2 or [0.0, 0.0]
+    percentiles = statistics.quantiles(timings, n=100, method='inclusive')
+    return {
+        'min': round(min(timings), 3),
+        'mean': round(statistics.fmean(timings), 3),
+        'p50': round(percentiles[49], 3),
+        'p95': round(percentiles[94], 3),
+        'p99': round(percentiles[98], 3),
+        'max': round(max(timings), 3),
+    }
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class _PooledWSGIServer(WSGIServer):
+    """Serves requests on a fixed number of threads, like a sync worker budget; the rest wait."""
+
+    request_queue_size = 1024
+
+    def __init__(self, *args, workers, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            connections.close_all()
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class LiveServer:
+    """
+    This project's WSGI app on a random local port: one thread per request,
+    or at most ``workers`` requests at a time.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+
+    def __enter__(self):
+        if self.workers:
+            self.server = _PooledWSGIServer(('127.0.0.1', 0), _QuietHandler, workers=self.workers)
+        else:
+            self.server = ThreadedWSGIServer(('127.0.0.1', 0), _QuietHandler, allow_reuse_address=False)
+        self.server.set_app(WSGIHandler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+class AsgiLiveServer:
+    """
+    This project's ASGI app (bitsa_project.asgi) served by uvicorn on one
+    event loop in a background thread. Requires uvicorn.
+    """
+
+    def __enter__(self):
+        import uvicorn
+        from django.core.asgi import get_asgi_application
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.bind(('127.0.0.1', 0))
+        config = uvicorn.Config(
+            get_asgi_application(), loop='asyncio', lifespan='off', access_log=False,
+            log_level='warning', backlog=1024,
+        )
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, kwargs={'sockets': [self.socket]}, daemon=True)
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError('The ASGI server did not start.')
+            time.sleep(0.01)
+        self.url = f'http://127.0.0.1:{self.socket.getsockname()[1]}'
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join()
+        self.socket.close()
+
+
+class Dataset:
+    """Seed data sized like a busy semester, plus tokens for authenticated scenarios."""
+
+    def __init__(self, users=300, events=100, attendees_per_event=20, posts=100, photos=100):
+        from about.models import Leadership
+        from blogs.models import BlogPost
+        from events.models import Event
+        from events.signals import refresh_attendee_counts
+        from gallery.models import Photo
+        from . import search
+
+        now = timezone.now()
+        # one hash for everybody: seeding should not take users x PBKDF2
+        password = make_password(PASSWORD)
+        User.objects.bulk_create([
+            User(username=f'bench{i}', email=f'bench{i}@example.com', first_name='Bench', last_name=str(i), password=password)
+            for i in range(users)
+        ], batch_size=500)
+        self.admin = User.objects.create(username='bench-admin', is_staff=True, is_superuser=True, password=password)
+        self.users = list(User.objects.filter(username__startswith='bench', is_staff=False).order_by('pk'))
+        organizers = self.users[:10]
+
+        Event.objects.bulk_create([
+            Event(
+                title=f'Bench event {i}', description='Hackathon workshop and demo day. ' * 20,
+                organizer=organizers[i % len(organizers)], location=f'Lab {i % 5}',
+                start_time=now + timedelta(days=i - events // 2),
+            )
+            for i in range(events)
+        ], batch_size=500)
+        self.events = list(Event.objects.order_by('pk').values_list('pk', flat=True))
+        Attendance = Event.attendees.through
+        Attendance.objects.bulk_create([
+            Attendance(event_id=event_id, user_id=self.users[(n * 3 + k) % len(self.users)].pk)
+            for n, event_id in enumerate(self.events)
+            for k in range(min(attendees_per_event, len(self.users)))
+        ], batch_size=2000, ignore_conflicts=True)
+        refresh_attendee_counts(self.events)
+        # RSVP bursts all target one event nobody attends yet
+        self.rsvp_event = Event.objects.create(
+            title='Launch night', description='Everyone RSVPs at once.', organizer=organizers[0], start_time=now + timedelta(days=7)
+        ).pk
+
+        BlogPost.objects.bulk_create([
+            BlogPost(title=f'Bench post {i}', content='Notes from the hackathon. ' * 80,
+                     author=organizers[i % len(organizers)], is_published=True)
+            for i in range(posts)
+        ], batch_size=500)
+        self.posts = list(BlogPost.objects.values_list('pk', flat=True))
+        search.index_objects(Event, self.events)
+        search.index_objects(BlogPost, self.posts)
+
+        Photo.objects.bulk_create([
+            Photo(title=f'Bench photo {i}', image=f'gallery/bench{i}.jpg', uploaded_by=organizers[i % len(organizers)])
+            for i in range(photos)
+        ], batch_size=500)
+        Leadership.objects.bulk_create([
+            Leadership(name=f'Leader {i}', position=position, leadership_type='top' if i < 2 else 'student', order=i)
+            for i, (position, _) in enumerate(Leadership.POSITION_CHOICES)
+        ])
+
+        self.admin_token = str(RefreshToken.for_user(self.admin).access_token)
+        self.user_tokens = [str(RefreshToken.for_user(user).access_token) for user in self.users]
+
+
+# Each scenario maps a request number to (method, path, json body, bearer token)
+
+def browse(data, n):
+    paths = (
+        '/api/events/',
+        f'/api/events/{data.events[n % len(data.events)]}/',
+        '/api/events/?upcoming=true&page_size=20',
+        '/api/blogs/posts/',
+        f'/api/blogs/posts/{data.posts[n % len(data.posts)]}/',
+        '/api/gallery/photos/',
+        '/api/leadership/',
+        '/api/auth/stats/',
+    )
+    return 'GET', paths[n % len(paths)], None, None
+
+
+def login(data, n):
+    return 'POST', '/api/auth/login/', {'username': data.users[n % len(data.users)].username, 'password': PASSWORD}, None
+
+
+def rsvp(data, n):
+    return 'POST', f'/api/events/{data.rsvp_event}/rsvp/', None, data.user_tokens[n % len(data.user_tokens)]
+
+
+def admin_users(data, n):
+    return 'GET', '/api/auth/users/?page_size=50', None, data.admin_token
+
+
+SCENARIOS = {
+    'browse': browse,
+    'login': login,
+    'rsvp': rsvp,
+    'admin_users': admin_users,
+}
+
+
+def _send(base_url, method, path, body, token):
+    headers = {'Accept': 'application/json'}
+    payload = None
+    if body is not None:
+        payload = json.dumps(body).encode()
+        headers['Content-Type'] = 'application/json'
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    start = time.perf_counter()
+    try:
+        with urlopen(Request(base_url + path, data=payload, headers=headers, method=method), timeout=60) as response:
+            response.read()
+            status = response.status
+    except HTTPError as exc:
+        exc.read()
+        status = exc.code
+    except (URLError, OSError):
+        status = None
+    return status, (time.perf_counter() - start) * 1000
+
+
+def run_scenario(base_url, data, scenario, requests, concurrency):
+    """Fire ``requests`` requests of ``scenario`` from ``concurrency`` threads."""
+    build = SCENARIOS[scenario]
+    calls = [build(data, n) for n in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda call: _send(base_url, *call), calls))
+    wall = time.perf_counter() - start
+
+    statuses = Counter('error' if status is None else str(status) for status, _ in results)
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'duration_s': round(wall, 3),
+        'throughput_rps': round(requests / wall, 2) if wall else None,
+        'errors': sum(count for status, count in statuses.items() if status == 'error' or status >= '500'),
+        'status_counts': dict(sorted(statuses.items())),
+        'latency_ms': latency_summary([elapsed for _, elapsed in results]),
+    }
@@ -0,0 +1,85 @@
+"""
+Constant resources: small JSON documents that only change with a deploy,
+such as the choices of a model field.
+
+Each resource is serialized to bytes once when it is registered (from an
+``AppConfig.ready``) and served by a plain Django view, bypassing DRF
+content negotiation, authentication and permissions. The body hash is both
+the strong ETag and the resource version:
+
+* ``/api/constants/<name>/<version>/`` is immutable and cached for a year;
+  a stale version redirects to the current one.
+* ``/api/constants/<name>/`` always serves the current body with a short
+  ``max-age`` and the ETag, for clients that cannot track versions.
+* ``/api/constants/`` maps every name to its versioned URL.
+"""
+import hashlib
+import json
+
+from django.http import Http404, HttpResponse, HttpResponseNotModified, HttpResponseRedirect
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+CURRENT_MAX_AGE = 300
+
+_registry = {}
+
+
+class ConstantResource:
+    def __init__(self, name, data):
+        self.name = name
+        # same bytes DRF's JSONRenderer would produce
+        self.body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+        self.version = hashlib.sha256(self.body).hexdigest()[:16]
+        self.etag = f'"{self.version}"'
+
+    def url(self):
+        return reverse('constant-version', kwargs={'name': self.name, 'version': self.version})
+
+    def response(self, request, max_age, immutable=False):
+        if self.etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(self.body, content_type='application/json')
+        response['ETag'] = self.etag
+        response['Cache-Control'] = f'public, max-age={max_age}' + (', immutable' if immutable else '')
+        return response
+
+
+def register(name, data):
+    """Register (or replace) the constant resource ``name``."""
+    resource = _registry[name] = ConstantResource(name, data)
+    return resource
+
+
+def choices_resource(name, model, field_name):
+    """Register ``{value: label}`` for a choices-backed model field."""
+    field = model._meta.get_field(field_name)
+    return register(name, {str(value): str(label) for value, label in field.flatchoices})
+
+
+def get_resource(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise Http404(f'Unknown constant resource {name!r}')
+
+
+@require_safe
+def constant_index(request):
+    data = {name: resource.url() for name, resource in sorted(_registry.items())}
+    return HttpResponse(json.dumps(data, separators=(',', ':')), content_type='application/json')
+
+
+@require_safe
+def constant_current(request, name):
+    return get_resource(name).response(request, CURRENT_MAX_AGE)
+
+
+@require_safe
+def constant_version(request, name, version):
+    resource = get_resource(name)
+    if version != resource.version:
+        return HttpResponseRedirect(resource.url())
+    return resource.response(request, IMMUTABLE_MAX_AGE, immutable=True)
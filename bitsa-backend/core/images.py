@@ -0,0 +1,175 @@
+"""
+Responsive image variants for uploaded photos.
+
+Every model with an ``image`` field and an ``image_variants`` JSON field gets
+resized WebP and JPEG copies (EXIF stripped, orientation applied) generated
+off the request thread. ``image_variants`` records what was produced:
+
+    {"source": "gallery/photo.jpg",
+     "formats": {"webp": {"320": "gallery/variants/photo-1a2b3c4d-320w.webp", ...},
+                 "jpeg": {...}}}
+
+Variant names carry a hash of their bytes, so they can be cached forever.
+Work is queued on a small thread pool once the saving transaction commits;
+``IMAGE_PIPELINE_SYNC = True`` runs it inline instead (useful for scripts).
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .response_cache import bump_generation
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'webp': {'format': 'WEBP', 'method': 4},
+    'jpeg': {'format': 'JPEG', 'optimize': True, 'progressive': True},
+}
+
+# <basename>-<sha256 prefix>-<width>w.<format>; the digest makes the name content-addressed
+VARIANT_NAME_RE = re.compile(r'-(?P<digest>[0-9a-f]{12})-\d+w\.\w+$')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def variant_widths():
+    return sorted(getattr(settings, 'IMAGE_VARIANT_WIDTHS', (320, 640, 1280)))
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMAGE_PIPELINE_WORKERS', 2),
+                thread_name_prefix='image-variants',
+            )
+        return _executor
+
+
+def needs_variants(instance):
+    source = instance.image.name if instance.image else ''
+    return (instance.image_variants or {}).get('source', '') != source
+
+
+def enqueue(instance):
+    """Schedule variant generation for ``instance`` once the current transaction commits."""
+    label = instance._meta.label
+    pk = instance.pk
+    if getattr(settings, 'IMAGE_PIPELINE_SYNC', False):
+        transaction.on_commit(lambda: process(label, pk))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_worker, label, pk))
+
+
+def _run_in_worker(label, pk):
+    close_old_connections()
+    try:
+        process(label, pk)
+    except Exception:
+        logger.exception("Generating image variants failed for %s %s", label, pk)
+    finally:
+        close_old_connections()
+
+
+def process(label, pk):
+    """Generate variants for one row and store the result on it."""
+    model = apps.get_model(label)
+    instance = model._default_manager.filter(pk=pk).only('pk', 'image', 'image_variants').first()
+    if instance is None or not needs_variants(instance):
+        return
+
+    previous = instance.image_variants or {}
+    if instance.image:
+        variants = build_variants(instance.image)
+        unchanged = Q(image=instance.image.name)
+    else:
+        variants = {}
+        unchanged = Q(image='') | Q(image__isnull=True)
+    # Only record the result if the image was not replaced in the meantime
+    updated = model._default_manager.filter(unchanged, pk=pk).update(image_variants=variants)
+    if updated:
+        # queryset.update() sends no post_save: drop cached responses by hand
+        bump_generation(model._meta.label_lower)
+        delete_variants(previous, keep=variants)
+    else:
+        delete_variants(variants)
+
+
+def build_variants(field_file):
+    storage = field_file.storage
+    stem, _ = os.path.splitext(field_file.name)
+    directory, basename = os.path.split(stem)
+    widths = variant_widths()
+
+    try:
+        with storage.open(field_file.name, 'rb') as fh:
+            image = Image.open(fh)
+            # let the JPEG decoder scale down while decoding large phone photos
+            image.draft('RGB', (widths[-1], widths[-1]))
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning("Could not read image %s for variants", field_file.name)
+        return {'source': field_file.name, 'formats': {}}
+
+    targets = [w for w in widths if w < image.width] or [image.width]
+    formats = {name: {} for name in FORMATS}
+    quality = getattr(settings, 'IMAGE_VARIANT_QUALITY', 80)
+
+    for width in targets:
+        resized = image
+        if width < image.width:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for name, options in FORMATS.items():
+            data = _encode(resized, name, options, quality)
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            path = os.path.join(directory, 'variants', f"{basename}-{digest}-{width}w.{name}")
+            if not storage.exists(path):
+                path = storage.save(path, ContentFile(data))
+            formats[name][str(width)] = path
+
+    return {'source': field_file.name, 'formats': formats}
+
+
+def _encode(image, name, options, quality):
+    if name == 'jpeg' or image.mode not in ('RGB', 'RGBA'):
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            image = image.convert('RGBA')
+            if name == 'jpeg':
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.split()[-1])
+                image = background
+        else:
+            image = image.convert('RGB')
+    buffer = BytesIO()
+    # no exif= argument, so EXIF/GPS metadata is not carried over
+    image.save(buffer, quality=quality, **options)
+    return buffer.getvalue()
+
+
+def delete_variants(variants, keep=None):
+    keep_names = {
+        path for sizes in (keep or {}).get('formats', {}).values() for path in sizes.values()
+    }
+    for sizes in (variants or {}).get('formats', {}).values():
+        for path in sizes.values():
+            if path not in keep_names:
+                try:
+                    default_storage.delete(path)
+                except OSError:
+                    logger.warning("Could not delete image variant %s", path)
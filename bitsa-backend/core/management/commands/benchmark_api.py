@@ -0,0 +1,132 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.utils import timezone
+
+from core import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the API: seed a throwaway test database, serve the project on a live "
+        "WSGI or ASGI server and drive concurrent scenarios against it. Prints latency "
+        "percentiles and throughput as JSON. --server compare runs the same load against "
+        "both, one process each."
+    )
+    # the URLconf must not be loaded before ASYNC_VIEWS is set for the chosen server
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenarios', default=','.join(benchmark.SCENARIOS),
+                            help='Comma-separated subset of: ' + ', '.join(benchmark.SCENARIOS))
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=8, help='Client threads per scenario')
+        parser.add_argument('--users', type=int, default=300)
+        parser.add_argument('--events', type=int, default=100)
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+        parser.add_argument('--keepdb', action='store_true', help='Reuse the test database between runs')
+        parser.add_argument('--server', choices=('wsgi', 'asgi', 'compare'), default='wsgi',
+                            help='wsgi: sync views on --workers threads (unbounded without it); '
+                                 'asgi: bitsa_project.asgi on one event loop with async views; '
+                                 'compare: both, each in a fresh process')
+        parser.add_argument('--workers', type=int,
+                            help='Request threads of the WSGI server (a sync worker budget); set '
+                                 '--concurrency above it to see requests queue. The ASGI server is one '
+                                 'process with one event loop either way')
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(benchmark.SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        if connection.vendor == 'sqlite':
+            test_settings = connection.settings_dict['TEST']
+            if not test_settings.get('NAME'):
+                # server threads need a database file they can all open
+                test_settings['NAME'] = os.path.join(tempfile.gettempdir(), 'bitsa_benchmark.sqlite3')
+            # queue concurrent writers (RSVP bursts) instead of failing with "database is locked"
+            connection.settings_dict['OPTIONS'].setdefault('timeout', 30)
+            connection.settings_dict['OPTIONS'].setdefault('transaction_mode', 'IMMEDIATE')
+
+        if options['server'] == 'compare':
+            report = self.compare(options)
+        else:
+            report = self.run(scenarios, options)
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+        self.stdout.write(output)
+
+    def compare(self, options):
+        """Run each server in its own process: URL routing is fixed once the URLconf is loaded."""
+        reports = {}
+        for server in ('wsgi', 'asgi'):
+            with tempfile.NamedTemporaryFile(suffix='.json') as output:
+                command = [
+                    sys.executable, '-m', 'django', 'benchmark_api', '--server', server, '--output', output.name,
+                    '--scenarios', options['scenarios'], '--requests', str(options['requests']),
+                    '--concurrency', str(options['concurrency']), '--users', str(options['users']),
+                    '--events', str(options['events']),
+                ]
+                if options['workers']:
+                    command += ['--workers', str(options['workers'])]
+                if options['keepdb']:
+                    command.append('--keepdb')
+                env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE))
+                result = subprocess.run(command, cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL)
+                if result.returncode:
+                    raise CommandError(f'The {server} benchmark failed (exit status {result.returncode}).')
+                reports[server] = json.load(output)
+        return {
+            'meta': dict(reports['wsgi']['meta'], server='compare'),
+            'servers': {server: report['scenarios'] for server, report in reports.items()},
+        }
+
+    def run(self, scenarios, options):
+        server_name = options['server']
+        if server_name == 'asgi':
+            try:
+                import uvicorn  # noqa: F401
+            except ImportError:
+                raise CommandError('--server asgi needs uvicorn (pip install uvicorn).')
+
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            with override_settings(DEBUG=False, IMAGE_PIPELINE_SYNC=True, ASYNC_VIEWS=server_name == 'asgi'):
+                data = benchmark.Dataset(users=options['users'], events=options['events'])
+                if server_name == 'asgi':
+                    live_server = benchmark.AsgiLiveServer()
+                else:
+                    live_server = benchmark.LiveServer(workers=options['workers'])
+                with live_server as server:
+                    results = {
+                        name: benchmark.run_scenario(server.url, data, name, options['requests'], options['concurrency'])
+                        for name in scenarios
+                    }
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+
+        return {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'server': server_name,
+                'workers': options['workers'],
+                'users': options['users'],
+                'events': options['events'],
+            },
+            'scenarios': results,
+        }
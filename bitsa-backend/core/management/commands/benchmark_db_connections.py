@@ -0,0 +1,121 @@
+import copy
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+
+MODES = ('fresh', 'persistent', 'pool')
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request database latency with a fresh connection per request, "
+        "persistent connections (CONN_MAX_AGE) and a psycopg connection pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per mode')
+        parser.add_argument('--modes', default=','.join(MODES), help='Comma-separated subset of: ' + ', '.join(MODES))
+        parser.add_argument('--query', default='SELECT 1', help='SQL run once per simulated request')
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f"Unknown mode(s): {', '.join(sorted(unknown))}")
+        if options['requests'] < 2:
+            raise CommandError("--requests must be at least 2")
+
+        alias = options['database']
+        base = connections[alias].settings_dict
+        results = {}
+        for mode in modes:
+            settings_dict = self.settings_for(mode, base)
+            if settings_dict is None:
+                self.stderr.write(f"Skipping {mode}: needs PostgreSQL with psycopg 3 and psycopg_pool installed.")
+                continue
+            connection = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, alias)
+            results[mode] = self.run(connection, options['query'], options['requests'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'mode':<12}{'connects':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for mode, row in results.items():
+            self.stdout.write(
+                f"{mode:<12}{row['connects']:>10}{row['mean_ms']:>10.3f}"
+                f"{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}{row['p99_ms']:>10.3f}"
+            )
+
+    def settings_for(self, mode, base):
+        """A copy of the configured connection settings adjusted for ``mode``."""
+        settings_dict = copy.deepcopy(base)
+        options = settings_dict.setdefault('OPTIONS', {})
+        configured_pool = options.pop('pool', None)
+
+        if mode == 'fresh':
+            settings_dict.update(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False)
+        elif mode == 'persistent':
+            settings_dict.update(CONN_MAX_AGE=base.get('CONN_MAX_AGE') or 60, CONN_HEALTH_CHECKS=True)
+        else:
+            if not self.pool_available(settings_dict):
+                return None
+            settings_dict.update(CONN_MAX_AGE=0)
+            options['pool'] = configured_pool or {'min_size': 1, 'max_size': 2}
+        return settings_dict
+
+    def pool_available(self, settings_dict):
+        if not settings_dict['ENGINE'].endswith('postgresql'):
+            return False
+        try:
+            from django.db.backends.postgresql.psycopg_any import is_psycopg3
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            return False
+        return is_psycopg3
+
+    def run(self, connection, query, count):
+        """
+        Replay ``count`` request cycles the way Django's request_started /
+        request_finished handlers drive a connection, timing each one.
+        """
+        connects = 0
+
+        def on_connect(sender, **kwargs):
+            nonlocal connects
+            if kwargs['connection'] is connection:
+                connects += 1
+
+        connection_created.connect(on_connect)
+        timings = []
+        try:
+            for _ in range(count):
+                start = time.perf_counter()
+                connection.close_if_unusable_or_obsolete()
+                with connection.cursor() as cursor:
+                    cursor.execute(query)
+                    cursor.fetchall()
+                connection.close_if_unusable_or_obsolete()
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection_created.disconnect(on_connect)
+            connection.close()
+            close_pool = getattr(connection, 'close_pool', None)
+            if close_pool is not None:
+                close_pool()
+
+        percentiles = statistics.quantiles(timings, n=100, method='inclusive')
+        return {
+            'requests': count,
+            'connects': connects,
+            'mean_ms': statistics.fmean(timings),
+            'p50_ms': percentiles[49],
+            'p95_ms': percentiles[94],
+            'p99_ms': percentiles[98],
+        }
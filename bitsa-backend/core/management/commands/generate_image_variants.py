@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from about.models import Leadership
+from blogs.models import BlogPost
+from events.models import Event
+from gallery.models import Photo
+from core import images
+
+
+class Command(BaseCommand):
+    help = "Generate missing responsive image variants for photos, events, blog posts and leaders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants even where they are already up to date'
+        )
+
+    def handle(self, *args, **options):
+        for model in (Photo, Event, BlogPost, Leadership):
+            processed = 0
+            rows = model.objects.exclude(image='').exclude(image__isnull=True).only('pk', 'image', 'image_variants')
+            for instance in rows.iterator(chunk_size=200):
+                if options['force']:
+                    model.objects.filter(pk=instance.pk).update(image_variants={})
+                elif not images.needs_variants(instance):
+                    continue
+                images.process(model._meta.label, instance.pk)
+                processed += 1
+            self.stdout.write(f"{model._meta.verbose_name_plural}: generated variants for {processed} image(s).")
+
+        self.stdout.write(self.style.SUCCESS("Image variants up to date."))
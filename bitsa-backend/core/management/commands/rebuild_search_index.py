@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from blogs.models import BlogPost
+from events.models import Event
+from core import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for blog posts and events."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows indexed per batch (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        backend = search.get_backend()
+        batch_size = options['batch_size']
+
+        for model in (BlogPost, Event):
+            pks = list(model.objects.order_by('pk').values_list('pk', flat=True))
+            for start in range(0, len(pks), batch_size):
+                backend.index(model, pks[start:start + batch_size])
+            self.stdout.write(f"Indexed {len(pks)} {model._meta.verbose_name_plural} ({backend.name} backend).")
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,209 @@
+"""
+Media delivery: serves uploaded files under ``MEDIA_URL``.
+
+``MEDIA_DELIVERY`` picks who sends the bytes:
+
+* ``'python'`` (default): Django streams the file itself, with
+  ``Range`` requests (single ranges, honouring ``If-Range``), ``ETag`` /
+  ``Last-Modified`` revalidation and ``Accept-Ranges``;
+* ``'x-accel-redirect'``: Django only checks the path and answers with an
+  ``X-Accel-Redirect`` to ``MEDIA_ACCEL_PREFIX`` + path, which nginx serves
+  from an ``internal`` location, e.g.::
+
+      location /protected-media/ {
+          internal;
+          alias /srv/bitsa/media/;
+      }
+
+* ``'x-sendfile'``: the same handoff with an ``X-Sendfile`` header carrying
+  the absolute path (Apache mod_xsendfile, lighttpd).
+
+In the offload modes the proxy sends the body and handles ranges, so
+application workers are released as soon as the headers are written.
+
+Under ASGI (``bitsa_project.asgi``) the ``'python'`` mode streams through an
+async iterator that reads each chunk in a worker thread (see
+core.async_views.streaming_content); a sync iterator or ``FileResponse``
+would be read into memory whole before sending. Every chunk still costs a
+thread hop, so ASGI deployments with sizeable media should use one of the
+offload modes.
+Revalidations (``If-None-Match`` / ``If-Modified-Since``) are answered
+with a 304 before any handoff.
+
+Every mode sends the same ``Cache-Control``: content-hashed names (image
+variants, see core.images) never change, so they are ``immutable`` and
+cached for a year; anything else is cached for ``MEDIA_CACHE_MAX_AGE``
+seconds and then revalidated.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .async_views import is_asgi, streaming_content
+from .images import VARIANT_NAME_RE
+
+MODES = ('python', 'x-accel-redirect', 'x-sendfile')
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def delivery_mode():
+    mode = _setting('MEDIA_DELIVERY', 'python')
+    if mode not in MODES:
+        raise ImproperlyConfigured(f"MEDIA_DELIVERY must be one of {', '.join(MODES)}, not {mode!r}.")
+    return mode
+
+
+def cache_control(path):
+    if VARIANT_NAME_RE.search(path):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f"public, max-age={_setting('MEDIA_CACHE_MAX_AGE', 3600)}"
+
+
+def file_etag(path, stat):
+    # a content-hashed name is its own validator and is the same on every server
+    match = VARIANT_NAME_RE.search(path)
+    if match:
+        return f'"{match["digest"]}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` (inclusive) for a single ``bytes=`` range, ``None`` to
+    send the whole file (no header, several ranges or a syntax the spec says
+    to ignore), or ``False`` when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if start >= size:
+        return False
+    if last and int(last) < start:
+        # invalid, so ignored
+        return None
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.headers.get('If-Range')
+    if value is None:
+        return True
+    if value.startswith(('"', 'W/')):
+        # If-Range needs a strong comparison
+        return value == etag
+    return parse_http_date_safe(value) == last_modified
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def _content_type(path):
+    content_type, encoding = mimetypes.guess_type(path)
+    # like FileResponse: compressed files are sent as such, not decoded by the client
+    return {'gzip': 'application/gzip', 'bzip2': 'application/x-bzip', 'xz': 'application/x-xz'}.get(
+        encoding, content_type or 'application/octet-stream'
+    )
+
+
+def _python_response(request, path, full_path, stat, etag, last_modified):
+    byte_range = None
+    if _if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+    if byte_range is None and not is_asgi(request):
+        response = FileResponse(open(full_path, 'rb'), content_type=_content_type(path))
+    else:
+        start, end = byte_range or (0, stat.st_size - 1)
+        length = end - start + 1
+        content = streaming_content(request, _read_range(full_path, start, length), thread_sensitive=False)
+        response = StreamingHttpResponse(content, status=206 if byte_range else 200, content_type=_content_type(path))
+        response['Content-Length'] = str(length)
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _handoff_response(mode, path, full_path):
+    # the proxy keeps these headers and replaces the empty body with the file
+    response = HttpResponse(content_type=_content_type(path))
+    if mode == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = _setting('MEDIA_ACCEL_PREFIX', '/protected-media/') + quote(path)
+    else:
+        response['X-Sendfile'] = full_path
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """The file at ``path`` under ``MEDIA_ROOT``, delivered as ``MEDIA_DELIVERY`` says."""
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404('File not found.')
+    if not os.path.isfile(full_path):
+        raise Http404('File not found.')
+
+    mode = delivery_mode()
+    etag = file_etag(path, stat)
+    last_modified = int(stat.st_mtime)
+    # revalidations are answered here in every mode; they need no file I/O
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None and mode == 'python':
+        response = _python_response(request, path, full_path, stat, etag, last_modified)
+    elif response is None:
+        response = _handoff_response(mode, path, full_path)
+    if response.status_code in (200, 206, 304):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = cache_control(path)
+    return response
+
+
+def media_urlpatterns():
+    """The ``MEDIA_URL`` route; empty when media is served from another host (a CDN URL)."""
+    prefix = settings.MEDIA_URL
+    if not prefix:
+        raise ImproperlyConfigured('MEDIA_URL must be set to serve media.')
+    if prefix.startswith(('http://', 'https://', '//')):
+        return []
+    return [re_path(r'^%s(?P<path>.+)$' % re.escape(prefix.lstrip('/')), serve_media, name='media')]
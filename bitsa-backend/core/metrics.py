@@ -0,0 +1,265 @@
+"""
+Per-request instrumentation.
+
+``RequestMetricsMiddleware`` records for every request:
+
+* the number of SQL queries and the time spent in them;
+* the time spent serializing objects (``to_representation`` of the
+  top-level serializer of views using ``SerializationTimingMixin``, less
+  the SQL it runs) and rendering the response (DRF/template responses);
+* the total time and the response size.
+
+The numbers are sent back in a ``Server-Timing`` header (visible in the
+browser's network panel) when ``REQUEST_METRICS_HEADER`` is on, requests
+over ``SLOW_REQUEST_MS`` or ``SLOW_REQUEST_QUERIES`` and individual queries
+over ``SLOW_QUERY_MS`` are logged as warnings, and every request is added
+to a per-endpoint summary served to staff at ``/api/metrics/``. The summary
+lives in the worker process that served the request.
+
+Queries are counted by an execute wrapper installed on every database
+connection when it opens (see core.signals), which reports to the metrics of
+the current request through a context variable. Django connections belong
+to one thread and async views run their queries in ``sync_to_async``
+threads, so wrapping the connections of the thread that runs the middleware
+would miss them; the context variable follows the request into those
+threads.
+
+Views named in ``SLOW_REQUEST_EXEMPT_VIEWS`` are exempt from the time
+threshold (not the query one): logins and registrations hash a password
+with PBKDF2, which is slow on purpose.
+"""
+import contextvars
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+_summary = {}
+_summary_lock = threading.Lock()
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class RequestMetrics:
+    """Counters for one request; also the execute wrapper its queries go through."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.serialize_ms = 0.0
+        self.render_ms = 0.0
+        self.total_ms = 0.0
+        self.size = None
+        self.slow_query_ms = _setting('SLOW_QUERY_MS', 100)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            self.queries += 1
+            self.db_ms += duration
+            if duration >= self.slow_query_ms:
+                logger.warning("Slow query (%.1f ms): %s", duration, sql[:2000])
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize_ms:.1f}, '
+            f'render;dur={self.render_ms:.1f}, '
+            f'total;dur={self.total_ms:.1f}'
+        )
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    """Route ``connection``'s queries through ``record_query``; called once it opens."""
+    if record_query not in connection.execute_wrappers:
+        # first, so execute_wrapper() blocks, which pop the last wrapper, leave it alone
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def endpoint_label(request):
+    match = request.resolver_match
+    name = (match.view_name or match.route) if match else 'unresolved'
+    return f'{request.method} {name}'
+
+
+def is_slow(request, metrics):
+    if metrics.queries >= _setting('SLOW_REQUEST_QUERIES', 50):
+        return True
+    match = request.resolver_match
+    if match and match.view_name in _setting('SLOW_REQUEST_EXEMPT_VIEWS', ()):
+        return False
+    return metrics.total_ms >= _setting('SLOW_REQUEST_MS', 500)
+
+
+def record(endpoint, metrics, slow=False):
+    with _summary_lock:
+        row = _summary.setdefault(endpoint, {
+            'requests': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'queries': 0,
+            'max_queries': 0, 'db_ms': 0.0, 'serialize_ms': 0.0, 'render_ms': 0.0, 'bytes': 0, 'slow': 0,
+        })
+        row['requests'] += 1
+        row['total_ms'] += metrics.total_ms
+        row['max_ms'] = max(row['max_ms'], metrics.total_ms)
+        row['queries'] += metrics.queries
+        row['max_queries'] = max(row['max_queries'], metrics.queries)
+        row['db_ms'] += metrics.db_ms
+        row['serialize_ms'] += metrics.serialize_ms
+        row['render_ms'] += metrics.render_ms
+        row['bytes'] += metrics.size or 0
+        row['slow'] += slow
+
+
+def summary():
+    """Per-endpoint averages and maxima, most expensive endpoints first."""
+    with _summary_lock:
+        rows = [(endpoint, dict(row)) for endpoint, row in _summary.items()]
+    result = []
+    for endpoint, row in rows:
+        count = row['requests']
+        result.append({
+            'endpoint': endpoint,
+            'requests': count,
+            'avg_ms': round(row['total_ms'] / count, 2),
+            'max_ms': round(row['max_ms'], 2),
+            'avg_queries': round(row['queries'] / count, 2),
+            'max_queries': row['max_queries'],
+            'avg_db_ms': round(row['db_ms'] / count, 2),
+            'avg_serialize_ms': round(row['serialize_ms'] / count, 2),
+            'avg_render_ms': round(row['render_ms'] / count, 2),
+            'avg_bytes': round(row['bytes'] / count),
+            'slow_requests': row['slow'],
+        })
+    return sorted(result, key=lambda row: row['avg_ms'] * row['requests'], reverse=True)
+
+
+def reset():
+    with _summary_lock:
+        _summary.clear()
+
+
+class RequestMetricsMiddleware:
+    # async-capable so ASGI requests to async views stay on the event loop
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not _setting('REQUEST_METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = request._request_metrics = RequestMetrics()
+        start = time.perf_counter()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics = request._request_metrics = RequestMetrics()
+        start = time.perf_counter()
+        # sync_to_async copies the context, so queries in its threads are counted too
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, start)
+
+    def _finish(self, request, response, metrics, start):
+        metrics.total_ms = (time.perf_counter() - start) * 1000
+        if not response.streaming:
+            metrics.size = len(response.content)
+
+        if _setting('REQUEST_METRICS_HEADER', settings.DEBUG):
+            response['Server-Timing'] = metrics.server_timing()
+        slow = is_slow(request, metrics)
+        if slow:
+            logger.warning(
+                "Slow request %s %s: %.1f ms, %d queries (%.1f ms SQL), serialize %.1f ms, render %.1f ms, %s bytes",
+                request.method, request.get_full_path(), metrics.total_ms, metrics.queries,
+                metrics.db_ms, metrics.serialize_ms, metrics.render_ms, metrics.size,
+            )
+        record(endpoint_label(request), metrics, slow)
+        return response
+
+    def process_template_response(self, request, response):
+        # Called right before DRF/template responses are rendered
+        metrics = request._request_metrics
+        render_start = time.perf_counter()
+
+        def rendered(response):
+            metrics.render_ms = (time.perf_counter() - render_start) * 1000
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class SerializationTimingMixin:
+    """
+    Adds the time the view's serializers spend building ``.data`` to the
+    request's ``serialize_ms``. Only the top-level serializer is timed
+    (for ``many=True`` that is the list serializer), so nested serializers
+    are not counted twice; queries run while serializing (lazy relations)
+    stay under ``db``.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        metrics = getattr(self.request, '_request_metrics', None)
+        if metrics is not None:
+            serializer.to_representation = _timed(serializer.to_representation, metrics)
+        return serializer
+
+
+def _timed(to_representation, metrics):
+    def timed(instance):
+        start, db_ms = time.perf_counter(), metrics.db_ms
+        try:
+            return to_representation(instance)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            metrics.serialize_ms += elapsed - (metrics.db_ms - db_ms)
+    return timed
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([permissions.IsAdminUser])
+def metrics_summary(request):
+    """
+    Per-endpoint request metrics of this worker process (admin only).
+    GET /api/metrics/ - summary, most expensive endpoints first
+    DELETE /api/metrics/ - reset the counters
+    """
+    if request.method == 'DELETE':
+        reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(summary())
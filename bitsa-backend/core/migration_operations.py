@@ -0,0 +1,34 @@
+"""
+Migration operations shared by the apps.
+
+``AddPostgresIndex`` adds an index type only PostgreSQL has (GIN on a
+``tsvector`` or with ``pg_trgm`` operator classes). The index is part of the
+migration state on every database, matching the model's ``Meta.indexes``,
+but it is only created on PostgreSQL; the other databases search through
+core.SearchTerm instead.
+"""
+from django.db import migrations
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+            return
+        # SQLite rebuilds a table for some later changes and recreates every
+        # index of the state with it, this one as a plain index
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        connection = schema_editor.connection
+        with connection.cursor() as cursor:
+            existing = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        if self.index.name in existing:
+            schema_editor.remove_index(model, self.index)
+
+    def describe(self):
+        return f'{super().describe()} (PostgreSQL only)'
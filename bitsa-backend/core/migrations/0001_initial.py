@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField(default=1, help_text='Sum of field weights for every occurrence of the term')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['content_type', 'term', 'object_id'], name='core_searchterm_lookup_idx'), models.Index(fields=['content_type', 'object_id'], name='core_searchterm_object_idx')],
+            },
+        ),
+    ]
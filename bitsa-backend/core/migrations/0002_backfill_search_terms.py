@@ -0,0 +1,51 @@
+from collections import Counter
+
+from django.db import migrations
+
+from core.search import WEIGHT_SCORES, tokenize
+
+# frozen copy of the models' SEARCH_FIELDS at the time of this migration
+INDEXED_MODELS = {
+    ('blogs', 'blogpost'): {'title': 'A', 'excerpt': 'B', 'content': 'C'},
+    ('events', 'event'): {'title': 'A', 'location': 'B', 'description': 'C'},
+}
+
+
+def backfill_search_terms(apps, schema_editor):
+    # PostgreSQL installs search through the tsvector columns instead
+    if schema_editor.connection.vendor == 'postgresql':
+        return
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    SearchTerm = apps.get_model('core', 'SearchTerm')
+
+    for (app_label, model_name), fields in INDEXED_MODELS.items():
+        model = apps.get_model(app_label, model_name)
+        content_type, _ = ContentType.objects.get_or_create(app_label=app_label, model=model_name)
+        terms = []
+        for row in model.objects.values('pk', *fields).iterator():
+            weights = Counter()
+            for field, weight in fields.items():
+                for token in tokenize(row[field]):
+                    weights[token] += WEIGHT_SCORES[weight]
+            terms.extend(
+                SearchTerm(content_type=content_type, object_id=row['pk'], term=term, weight=weight)
+                for term, weight in weights.items()
+            )
+        SearchTerm.objects.bulk_create(terms, batch_size=1000)
+
+
+def clear_search_terms(apps, schema_editor):
+    apps.get_model('core', 'SearchTerm').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('blogs', '0003_blogpost_search_vector'),
+        ('events', '0004_event_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_terms, clear_search_terms),
+    ]
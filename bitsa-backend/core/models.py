@@ -0,0 +1,23 @@
+from django.db import models
+from django.contrib.contenttypes.models import ContentType
+
+
+class SearchTerm(models.Model):
+    """
+    One row per (object, term) in the portable full-text index used when the
+    database is not PostgreSQL (see core.search.SimpleSearchBackend).
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    term = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField(default=1, help_text="Sum of field weights for every occurrence of the term")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['content_type', 'term', 'object_id'], name='core_searchterm_lookup_idx'),
+            models.Index(fields=['content_type', 'object_id'], name='core_searchterm_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} ({self.content_type_id}:{self.object_id})"
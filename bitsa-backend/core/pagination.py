@@ -0,0 +1,181 @@
+"""
+Keyset (cursor) pagination shared by every list endpoint.
+
+Pages are addressed by the position of the last row seen instead of an
+offset, so fetching page N costs the same as fetching page 1 and rows
+inserted while a client is paging do not shift later pages. The ordering is
+taken from the queryset (``order_by`` or ``Meta.ordering``) and always ends
+with the primary key so rows sharing a timestamp are never skipped.
+
+Pagination is opt-in per request (``?page_size=`` or ``?cursor=``) unless
+``REST_FRAMEWORK['PAGE_SIZE']`` is configured, in which case every list is
+paginated by default. ``?page_size=`` is capped at ``API_MAX_PAGE_SIZE``.
+"""
+import base64
+import datetime
+import decimal
+import json
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import F, OrderBy, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorEncoder(json.JSONEncoder):
+    # Unlike DjangoJSONEncoder this keeps microseconds; a truncated timestamp
+    # would no longer compare equal to the row it came from.
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
+            return o.isoformat()
+        if isinstance(o, (decimal.Decimal, uuid.UUID)):
+            return str(o)
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    default_page_size = 20
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 100)
+        requested = request.query_params.get(self.page_size_query_param)
+        if requested:
+            try:
+                return max(1, min(int(requested), max_page_size))
+            except ValueError:
+                pass
+        if api_settings.PAGE_SIZE:
+            return min(api_settings.PAGE_SIZE, max_page_size)
+        if request.query_params.get(self.cursor_query_param):
+            return self.default_page_size
+        return None
+
+    def get_ordering(self, queryset):
+        """Return [(field, descending), ...] ending with the primary key."""
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        fields = []
+        for item in ordering:
+            if isinstance(item, OrderBy) and isinstance(item.expression, F):
+                fields.append((item.expression.name, item.descending))
+            elif isinstance(item, str) and item != '?':
+                fields.append((item.lstrip('-'), item.startswith('-')))
+            else:
+                raise ValueError(f"Cannot paginate on ordering {item!r}")
+
+        pk_name = queryset.model._meta.pk.name
+        if not any(name in ('pk', pk_name) for name, _ in fields):
+            descending = fields[-1][1] if fields else False
+            fields.append((pk_name, descending))
+        return fields
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views, fetching the page with the async ORM."""
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        return self.set_page([row async for row in page_queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """The unevaluated query for the requested page (plus one row), or None when not paginating."""
+        self.page_size = self.get_page_size(request)
+        if self.page_size is None:
+            return None
+
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        if self.position is not None:
+            queryset = queryset.filter(self.keyset_filter(self.position, self.reverse))
+        order_by = [
+            f"{'-' if descending != self.reverse else ''}{name}" for name, descending in self.ordering
+        ]
+        return queryset.order_by(*order_by)[:self.page_size + 1]
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        self.page = rows
+        return rows
+
+    def keyset_filter(self, position, reverse):
+        """Rows strictly after ``position`` (before it when paging backwards)."""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.ordering, position):
+            lookup = 'lt' if descending != reverse else 'gt'
+            if value is None:
+                equal &= Q(**{f'{name}__isnull': True})
+                continue
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = data['p'], bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, row, reverse):
+        position = [getattr(row, name) for name, _ in self.ordering]
+        payload = json.dumps({'p': position, 'r': int(reverse)}, cls=CursorEncoder, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
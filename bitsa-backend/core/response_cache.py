@@ -0,0 +1,144 @@
+"""
+Shared response cache for anonymous GET requests.
+
+Anonymous visitors all see the same data, so a rendered response can be
+served to the next anonymous visitor without touching the database or the
+DRF stack. ``AnonymousResponseCacheMixin`` stores rendered JSON bodies
+keyed by scheme, host, path, query string and ``Accept`` header; bodies
+hold absolute URLs (pagination links, image URLs) built from the first two.
+
+Invalidation is by generation: each model label has a counter in the cache
+(bumped from model signals, see core.signals) that is part of every key
+built from it. A bump makes all earlier entries unreachable and they expire
+on their own after ``RESPONSE_CACHE_TIMEOUT`` seconds, which also bounds
+staleness for time-dependent filters such as ``?upcoming``.
+
+Cached entries keep the ETag / Last-Modified set by ``ConditionalGetMixin``
+so revalidation requests can be answered with 304 straight from the cache.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+
+GENERATION_KEY = 'response:gen:{label}'
+RESPONSE_KEY = 'response:{digest}'
+STORED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Vary')
+
+
+def _timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def get_generations(labels):
+    """Current generation for each model label (1 when never bumped)."""
+    keys = {label: GENERATION_KEY.format(label=label) for label in labels}
+    found = cache.get_many(keys.values())
+    return [found.get(keys[label], 1) for label in labels]
+
+
+async def aget_generations(labels):
+    keys = {label: GENERATION_KEY.format(label=label) for label in labels}
+    found = await cache.aget_many(keys.values())
+    return [found.get(keys[label], 1) for label in labels]
+
+
+def bump_generation(label, using=None):
+    """
+    Invalidate every cached response built from model ``label`` once the
+    current transaction commits (immediately outside one). Bumping earlier
+    would let a concurrent request cache the pre-commit rows under the new
+    generation, where they would stay until the entry expires.
+    """
+    transaction.on_commit(lambda: _bump(label), using=using)
+
+
+def _bump(label):
+    key = GENERATION_KEY.format(label=label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # first change since the cache started: move past the implicit 1
+        cache.set(key, 2, None)
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Serve GET ``cache_actions`` to anonymous requests from the shared cache.
+
+    ``cache_models`` lists the models the response is built from; a change
+    to any of them invalidates the entry.
+    """
+
+    cache_models = ()
+    cache_actions = ('list', 'retrieve')
+
+    def is_response_cacheable(self, request):
+        if request.method != 'GET' or 'HTTP_AUTHORIZATION' in request.META:
+            return False
+        action_map = getattr(self, 'action_map', None)
+        return action_map is None or action_map.get('get') in self.cache_actions
+
+    def _cache_labels(self):
+        return [model._meta.label_lower for model in self.cache_models]
+
+    def _response_cache_key(self, request, generations):
+        digest = hashlib.md5('|'.join([
+            request.scheme,
+            request.get_host(),
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            *map(str, generations),
+        ]).encode(), usedforsecurity=False).hexdigest()
+        return RESPONSE_KEY.format(digest=digest)
+
+    def get_response_cache_key(self, request):
+        if not self.is_response_cacheable(request):
+            return None
+        return self._response_cache_key(request, get_generations(self._cache_labels()))
+
+    async def aget_response_cache_key(self, request):
+        if not self.is_response_cacheable(request):
+            return None
+        return self._response_cache_key(request, await aget_generations(self._cache_labels()))
+
+    def dispatch(self, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        if key is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        entry = cache.get(key)
+        if entry is not None:
+            return self._cached_response(request, entry)
+
+        response = super().dispatch(request, *args, **kwargs)
+        entry = self._cache_entry(response)
+        if entry is not None:
+            cache.set(key, entry, _timeout())
+        return response
+
+    def _cache_entry(self, response):
+        """What to store for ``response``, or None when it must not be cached."""
+        if response.status_code != 200 or response.streaming:
+            return None
+        if hasattr(response, 'render'):
+            response.render()  # sets Content-Type from the negotiated renderer
+        if 'json' not in response.get('Content-Type', ''):
+            return None
+        headers = {name: response[name] for name in STORED_HEADERS if response.has_header(name)}
+        return response.content, response['Content-Type'], headers
+
+    def _cached_response(self, request, entry):
+        content, content_type, headers = entry
+        last_modified = parse_http_date_safe(headers.get('Last-Modified', ''))
+        response = get_conditional_response(request, etag=headers.get('ETag'), last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+        for name, value in headers.items():
+            response[name] = value
+        patch_vary_headers(response, ('Authorization',))
+        return response
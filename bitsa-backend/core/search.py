@@ -0,0 +1,152 @@
+"""
+Full-text search for blog posts and events.
+
+Models opt in by declaring ``SEARCH_FIELDS`` (field name -> weight 'A'..'D')
+and, on PostgreSQL, a ``search_vector`` column. Two backends are available:
+
+* ``PostgresSearchBackend`` keeps the GIN-indexed ``search_vector`` column up
+  to date and ranks matches with ``ts_rank``.
+* ``SimpleSearchBackend`` keeps an inverted index in ``core.SearchTerm`` so
+  search works (and is tested) on SQLite without scanning the content columns.
+
+``settings.SEARCH_BACKEND`` picks one explicitly ('postgres' or 'simple');
+the default ('auto') follows the database vendor.
+"""
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast
+
+WEIGHT_SCORES = {'A': 8, 'B': 4, 'C': 2, 'D': 1}
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has in is it its of on or that the to was were will with
+""".split())
+
+
+def tokenize(text):
+    """Lower-case word tokens, without stop words and single characters."""
+    return [
+        token[:64] for token in TOKEN_RE.findall((text or '').lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def search_fields(model):
+    return getattr(model, 'SEARCH_FIELDS', {})
+
+
+class PostgresSearchBackend:
+    name = 'postgres'
+
+    @property
+    def config(self):
+        return getattr(settings, 'SEARCH_CONFIG', 'english')
+
+    def vector(self, model):
+        vector = None
+        for field, weight in search_fields(model).items():
+            part = SearchVector(field, weight=weight, config=self.config)
+            vector = part if vector is None else vector + part
+        return vector
+
+    def index(self, model, pks):
+        model._default_manager.filter(pk__in=list(pks)).update(search_vector=self.vector(model))
+
+    def remove(self, model, pks):
+        # the vector lives on the row itself and goes away with it
+        pass
+
+    def search(self, queryset, text):
+        query = SearchQuery(text, search_type='websearch', config=self.config)
+        # ts_rank returns float4, which no Python float equals exactly; keyset
+        # cursors (see core.pagination) need a rank that survives the JSON
+        # round trip, so compare in double precision
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=Cast(SearchRank(F('search_vector'), query), models.FloatField())
+        )
+
+
+class SimpleSearchBackend:
+    name = 'simple'
+
+    def index(self, model, pks):
+        from .models import SearchTerm
+
+        content_type = ContentType.objects.get_for_model(model)
+        fields = search_fields(model)
+        rows = model._default_manager.filter(pk__in=list(pks)).values('pk', *fields)
+
+        terms = []
+        indexed = []
+        for row in rows:
+            indexed.append(row['pk'])
+            weights = Counter()
+            for field, weight in fields.items():
+                for token in tokenize(row[field]):
+                    weights[token] += WEIGHT_SCORES[weight]
+            terms.extend(
+                SearchTerm(content_type=content_type, object_id=row['pk'], term=term, weight=weight)
+                for term, weight in weights.items()
+            )
+
+        with transaction.atomic():
+            SearchTerm.objects.filter(content_type=content_type, object_id__in=indexed).delete()
+            SearchTerm.objects.bulk_create(terms, batch_size=1000)
+
+    def remove(self, model, pks):
+        from .models import SearchTerm
+
+        content_type = ContentType.objects.get_for_model(model)
+        SearchTerm.objects.filter(content_type=content_type, object_id__in=list(pks)).delete()
+
+    def search(self, queryset, text):
+        from .models import SearchTerm
+
+        terms = set(tokenize(text))
+        if not terms:
+            return queryset.none()
+
+        content_type = ContentType.objects.get_for_model(queryset.model)
+        # objects containing every term, scored by the summed term weights
+        matches = (
+            SearchTerm.objects
+            .filter(content_type=content_type, term__in=terms)
+            .values('object_id')
+            .annotate(rank=Sum('weight'), hits=Count('term'))
+            .filter(hits=len(terms))
+        )
+        rank = matches.filter(object_id=OuterRef('pk')).values('rank')
+        return queryset.filter(pk__in=matches.values('object_id')).annotate(
+            search_rank=Subquery(rank, output_field=models.FloatField())
+        )
+
+
+BACKENDS = {
+    'postgres': PostgresSearchBackend,
+    'simple': SimpleSearchBackend,
+}
+
+
+def get_backend():
+    name = getattr(settings, 'SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        name = 'postgres' if connection.vendor == 'postgresql' else 'simple'
+    return BACKENDS[name]()
+
+
+def search(queryset, text):
+    """Filter ``queryset`` to rows matching ``text`` and annotate ``search_rank``."""
+    return get_backend().search(queryset, text)
+
+
+def index_objects(model, pks):
+    """(Re)index the given rows; call after saves that bypass signals, e.g. bulk_create."""
+    get_backend().index(model, pks)
@@ -0,0 +1,77 @@
+from django.core.files.storage import default_storage
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+from rest_framework import permissions, serializers
+
+# Characters of a long text column loaded (via Substr) to build list excerpts
+EXCERPT_SOURCE_CHARS = 600
+EXCERPT_WORDS = 40
+
+
+def auto_excerpt(text, words=EXCERPT_WORDS):
+    """Plain-text summary of the first ``words`` words of ``text``."""
+    return Truncator(' '.join(strip_tags(text or '').split())).words(words, truncate='\u2026')
+
+
+def absolute_url(request, url):
+    """
+    Like request.build_absolute_uri(url) for site-relative URLs, but computes
+    the scheme/host prefix once per request instead of once per row.
+    """
+    if request is None or not url.startswith('/'):
+        return url
+    base = getattr(request, '_absolute_url_base', None)
+    if base is None:
+        base = request.build_absolute_uri('/')[:-1]
+        request._absolute_url_base = base
+    return base + url
+
+
+class SparseFieldsMixin:
+    """
+    Let clients ask for a subset of fields on read requests, e.g.
+    ``?fields=id,title,image_url``. Unknown names are ignored; if none of
+    the requested names exist the full representation is returned.
+    """
+
+    fields_query_param = 'fields'
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # only the top-level serializer (or the child of a top-level list)
+        parent = self.parent
+        if parent is not None and not (isinstance(parent, serializers.ListSerializer) and parent.parent is None):
+            return fields
+
+        request = self.context.get('request')
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return fields
+        requested = getattr(request, 'query_params', request.GET).get(self.fields_query_param)
+        if not requested:
+            return fields
+
+        wanted = {name.strip() for name in requested.split(',')}
+        selected = {name: field for name, field in fields.items() if name in wanted}
+        return selected or fields
+
+
+class ImageSrcsetField(serializers.ReadOnlyField):
+    """
+    Render a model's ``image_variants`` as a srcset string per format, e.g.
+    {"webp": "https://host/media/a-320w.webp 320w, ...", "jpeg": "..."}.
+    Empty until the variants have been generated (see core.images).
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'image_variants')
+        super().__init__(**kwargs)
+
+    def to_representation(self, variants):
+        request = self.context.get('request')
+        srcset = {}
+        for fmt, sizes in (variants or {}).get('formats', {}).items():
+            srcset[fmt] = ', '.join(
+                f"{absolute_url(request, default_storage.url(path))} {width}w"
+                for width, path in sorted(sizes.items(), key=lambda item: int(item[0]))
+            )
+        return srcset
@@ -0,0 +1,81 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from about.models import Leadership
+from blogs.models import BlogPost
+from events.models import Event
+from gallery.models import Photo
+
+from . import images, metrics, search, stats
+from .response_cache import bump_generation
+
+
+@receiver(connection_created)
+def record_request_queries(sender, connection, **kwargs):
+    metrics.install_query_recorder(connection)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=Event)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_objects(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=Event)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.get_backend().remove(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Photo)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=Leadership)
+def queue_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw and images.needs_variants(instance):
+        images.enqueue(instance)
+
+
+@receiver(post_delete, sender=Photo)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=Leadership)
+def delete_image_variants(sender, instance, **kwargs):
+    transaction.on_commit(lambda: images.delete_variants(instance.image_variants))
+
+
+@receiver(post_save, sender=User)
+def invalidate_stats_on_new_user(sender, instance, created=False, **kwargs):
+    if created:
+        stats.invalidate_platform_stats()
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def invalidate_platform_stats(sender, **kwargs):
+    stats.invalidate_platform_stats()
+
+
+@receiver(post_save, sender=Leadership)
+@receiver(post_delete, sender=Leadership)
+def invalidate_leadership_stats(sender, **kwargs):
+    stats.invalidate_leadership_stats()
+
+
+@receiver(post_save, sender=Leadership)
+@receiver(post_delete, sender=Leadership)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Photo)
+@receiver(post_delete, sender=Photo)
+def invalidate_cached_responses(sender, **kwargs):
+    bump_generation(sender._meta.label_lower)
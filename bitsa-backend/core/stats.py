@@ -0,0 +1,110 @@
+"""
+Cached platform and leadership statistics.
+
+The landing page shows these numbers to every visitor, so they are computed
+once and kept in Django's cache until a relevant row changes (see the
+receivers in core.signals) or ``STATS_CACHE_TIMEOUT`` expires.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework.response import Response
+
+PLATFORM_STATS_KEY = 'stats:platform:{year}'
+LEADERSHIP_STATS_KEY = 'stats:leadership'
+
+
+def _timeout():
+    return getattr(settings, 'STATS_CACHE_TIMEOUT', 3600)
+
+
+def _platform_querysets(year):
+    from blogs.models import BlogPost
+    from events.models import Event
+
+    return {
+        # Active members: count of all users
+        'active_members': User.objects.all(),
+        # Annual events: count of events in the current year
+        'annual_events': Event.objects.filter(start_time__year=year),
+        # Projects: count of published blog posts (projects are documented as blog posts)
+        'projects': BlogPost.objects.filter(is_published=True),
+    }
+
+
+def get_platform_stats():
+    year = timezone.now().year
+    key = PLATFORM_STATS_KEY.format(year=year)
+    stats = cache.get(key)
+    if stats is None:
+        stats = {name: queryset.count() for name, queryset in _platform_querysets(year).items()}
+        cache.set(key, stats, _timeout())
+    return stats
+
+
+async def aget_platform_stats():
+    """get_platform_stats() for async views: async cache and ORM calls."""
+    year = timezone.now().year
+    key = PLATFORM_STATS_KEY.format(year=year)
+    stats = await cache.aget(key)
+    if stats is None:
+        stats = {name: await queryset.acount() for name, queryset in _platform_querysets(year).items()}
+        await cache.aset(key, stats, _timeout())
+    return stats
+
+
+def _leadership_aggregates():
+    from about.models import Leadership
+
+    return Leadership.objects.filter(is_active=True), {
+        'total_leaders': Count('pk'),
+        'top_leaders': Count('pk', filter=Q(leadership_type='top')),
+        'student_leaders': Count('pk', filter=Q(leadership_type='student')),
+    }
+
+
+def get_leadership_stats():
+    stats = cache.get(LEADERSHIP_STATS_KEY)
+    if stats is None:
+        queryset, aggregates = _leadership_aggregates()
+        stats = queryset.aggregate(**aggregates)
+        cache.set(LEADERSHIP_STATS_KEY, stats, _timeout())
+    return stats
+
+
+async def aget_leadership_stats():
+    stats = await cache.aget(LEADERSHIP_STATS_KEY)
+    if stats is None:
+        queryset, aggregates = _leadership_aggregates()
+        stats = await queryset.aaggregate(**aggregates)
+        await cache.aset(LEADERSHIP_STATS_KEY, stats, _timeout())
+    return stats
+
+
+def invalidate_platform_stats():
+    cache.delete(PLATFORM_STATS_KEY.format(year=timezone.now().year))
+
+
+def invalidate_leadership_stats():
+    cache.delete(LEADERSHIP_STATS_KEY)
+
+
+def stats_response(request, stats):
+    """
+    Response for a stats payload with a strong ETag and a short public
+    Cache-Control, answering 304 when the client already has this version.
+    """
+    digest = hashlib.md5(json.dumps(stats, sort_keys=True).encode(), usedforsecurity=False).hexdigest()
+    etag = f'"{digest}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = Response(stats)
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'STATS_MAX_AGE', 60))
+    return response
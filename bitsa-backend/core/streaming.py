@@ -0,0 +1,25 @@
+"""
+Helpers for streamed text exports (CSV, NDJSON), shared by the attendee
+exports and the bulk event export. Lines are joined into chunks of a few
+hundred, so the response iterator (and under ASGI the thread hop per chunk,
+see core.async_views.streaming_content) is not paid once per row.
+"""
+
+
+class Echo:
+    """File-like object whose write() hands the formatted line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def chunked(lines, size=500):
+    """Join ``lines`` into strings of ``size`` lines each."""
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
@@ -0,0 +1,185 @@
+"""
+Query-count regression suite.
+
+Seeds realistic volumes (hundreds of events and posts, thousands of
+attendances) and pins the number of queries each endpoint runs. The counts
+must not depend on how many rows exist, so an N+1 introduced anywhere in a
+serializer or queryset fails here. When an endpoint legitimately needs one
+more query, update its bound and say why in the commit.
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from about.models import Leadership
+from blogs.models import BlogPost
+from events.models import Event
+from events.signals import refresh_attendee_counts
+from gallery.models import Photo
+from . import search
+
+USERS = 1500
+EVENTS = 300
+ATTENDEES_PER_EVENT = 10
+POSTS = 200
+PHOTOS = 200
+
+
+# Exercise the views themselves, not the anonymous response cache
+@override_settings(RESPONSE_CACHE_TIMEOUT=0, SEARCH_BACKEND='simple')
+class EndpointQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        User.objects.bulk_create([
+            User(username=f'user{i}', email=f'user{i}@example.com', first_name='User', last_name=str(i))
+            for i in range(USERS)
+        ], batch_size=500)
+        cls.admin = User.objects.create(username='admin', is_staff=True, is_superuser=True)
+        users = list(User.objects.filter(is_staff=False).order_by('pk'))
+        cls.member = users[0]
+        organizers = users[:20]
+
+        Event.objects.bulk_create([
+            Event(
+                title=f'Event {i}', description='Workshop on hackathon tooling. ' * 20,
+                organizer=organizers[i % len(organizers)], location=f'Lab {i % 7}',
+                start_time=now + timedelta(days=i - EVENTS // 2), capacity=None if i % 3 else 50,
+            )
+            for i in range(EVENTS)
+        ], batch_size=500)
+        cls.events = list(Event.objects.order_by('pk'))
+        Attendance = Event.attendees.through
+        Attendance.objects.bulk_create([
+            Attendance(event_id=event.pk, user_id=users[(n * 7 + k) % len(users)].pk)
+            for n, event in enumerate(cls.events)
+            for k in range(ATTENDEES_PER_EVENT)
+        ], batch_size=2000)
+        refresh_attendee_counts(event.pk for event in cls.events)
+        cls.event = cls.events[-1]
+        cls.event.refresh_from_db()
+
+        BlogPost.objects.bulk_create([
+            BlogPost(
+                title=f'Post {i}', content='Lessons from the hackathon. ' * 100,
+                author=organizers[i % len(organizers)], is_published=bool(i % 4), category='News',
+            )
+            for i in range(POSTS)
+        ], batch_size=500)
+        cls.post = BlogPost.objects.filter(is_published=True).first()
+        search.index_objects(Event, [event.pk for event in cls.events])
+        search.index_objects(BlogPost, BlogPost.objects.values_list('pk', flat=True))
+
+        Photo.objects.bulk_create([
+            Photo(title=f'Photo {i}', image=f'gallery/photo{i}.jpg', uploaded_by=organizers[i % len(organizers)])
+            for i in range(PHOTOS)
+        ], batch_size=500)
+        cls.photo = Photo.objects.first()
+
+        Leadership.objects.bulk_create([
+            Leadership(name=f'Leader {i}', position=position, leadership_type='top' if i < 2 else 'student', order=i)
+            for i, (position, _) in enumerate(Leadership.POSITION_CHOICES)
+        ])
+        cls.leader = Leadership.objects.first()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def as_admin(self):
+        self.client.force_authenticate(self.admin)
+
+    def as_member(self):
+        self.client.force_authenticate(self.member)
+
+    def assertQueries(self, count, url, data=None, method='get'):
+        with self.assertNumQueries(count):
+            response = getattr(self.client, method)(url, data)
+        self.assertLess(response.status_code, 300, getattr(response, 'data', response))
+        return response
+
+    # events
+    # 1 = ETag aggregate (ConditionalGetMixin), +1 rows with organizer joined
+
+    def test_event_list(self):
+        response = self.assertQueries(2, '/events/')
+        self.assertEqual(len(response.data), EVENTS)
+
+    def test_event_list_filtered_and_paginated(self):
+        self.assertQueries(2, '/events/', {'upcoming': 'true', 'available': 'true', 'ordering': '-fill_level'})
+        self.assertQueries(2, '/events/', {'page_size': 50})
+        self.assertQueries(2, '/events/', {'search': 'hackathon'})
+
+    def test_event_detail(self):
+        # object for the ETag, then the object again inside retrieve()
+        self.assertQueries(2, f'/events/{self.event.pk}/')
+
+    def test_my_events(self):
+        self.as_member()
+        self.assertQueries(1, '/events/my-events/')
+
+    def test_rsvp_join_and_leave(self):
+        user = User.objects.exclude(events_attending=self.event).filter(is_staff=False).first()
+        self.client.force_authenticate(user)
+        # savepoint, lock, membership check, insert/delete, recount, release; how
+        # add() checks for existing rows differs by backend, hence an upper bound
+        for expected in ('added', 'removed'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(f'/events/{self.event.pk}/rsvp/')
+            self.assertEqual(response.data['status'], expected)
+            self.assertLessEqual(len(queries), 7)
+
+    def test_event_attendees(self):
+        self.as_admin()
+        response = self.assertQueries(2, f'/events/{self.event.pk}/attendees/')
+        self.assertEqual(len(response.data), ATTENDEES_PER_EVENT)
+
+    # blogs
+
+    def test_blog_list(self):
+        response = self.assertQueries(2, '/blogs/posts/')
+        self.assertEqual(len(response.data), POSTS * 3 // 4)
+        self.assertQueries(2, '/blogs/posts/', {'category': 'news', 'page_size': 20})
+        self.assertQueries(2, '/blogs/posts/', {'search': 'hackathon'})
+
+    def test_blog_list_as_admin_includes_drafts(self):
+        self.as_admin()
+        response = self.assertQueries(2, '/blogs/posts/')
+        self.assertEqual(len(response.data), POSTS)
+
+    def test_blog_detail(self):
+        self.assertQueries(2, f'/blogs/posts/{self.post.pk}/')
+
+    # gallery
+
+    def test_photo_list_and_detail(self):
+        response = self.assertQueries(2, '/gallery/photos/')
+        self.assertEqual(len(response.data), PHOTOS)
+        self.assertQueries(2, f'/gallery/photos/{self.photo.pk}/')
+
+    # leadership
+
+    def test_leadership_endpoints(self):
+        self.assertQueries(2, '/api/leadership/')
+        self.assertQueries(2, f'/api/leadership/{self.leader.pk}/')
+        self.assertQueries(0, '/api/leadership/positions/')
+        self.assertQueries(1, '/api/leadership/stats/')
+        self.assertQueries(0, '/api/leadership/stats/')
+
+    # accounts
+
+    def test_platform_stats(self):
+        self.assertQueries(3, '/api/auth/stats/')
+        self.assertQueries(0, '/api/auth/stats/')
+
+    def test_user_list(self):
+        self.as_admin()
+        response = self.assertQueries(1, '/api/auth/users/')
+        self.assertEqual(len(response.data), USERS + 1)
+        self.assertQueries(1, '/api/auth/users/', {'page_size': 100})
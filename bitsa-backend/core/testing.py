@@ -0,0 +1,30 @@
+"""
+Test helpers shared by the app test suites.
+"""
+from django.db import connection
+
+
+class QueryPlanAssertionsMixin:
+    """
+    ``assertUsesIndex(queryset, name)`` checks that the database's EXPLAIN plan
+    for ``queryset`` reads through the index ``name``.
+
+    Test tables hold a handful of rows, where a sequential scan is always
+    cheapest, so on PostgreSQL sequential scans are disabled for the EXPLAIN.
+    SQLite picks indexes by shape rather than cost and needs no help.
+    """
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+            try:
+                return queryset.explain()
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute('RESET enable_seqscan')
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.explain(queryset)
+        self.assertIn(index_name, plan, f'{index_name} not used by:\n{queryset.query}\n\n{plan}')
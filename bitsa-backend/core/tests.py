@@ -0,0 +1,367 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchRank
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, models
+from django.db.models.functions import Cast
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.views import astats as account_stats
+from blogs.models import BlogPost
+from blogs.views import BlogPostViewSet
+from events.models import Event
+from events.views import EventViewSet
+from . import metrics, search
+from .models import SearchTerm
+
+
+@override_settings(SEARCH_BACKEND='simple')
+class SimpleSearchBackendTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(username='author')
+        self.title_match = BlogPost.objects.create(
+            title='Hackathon recap', content='We built things.', author=self.author, is_published=True
+        )
+        self.body_match = BlogPost.objects.create(
+            title='Weekly notes', content='The hackathon was fun and the hackathon ran late.', author=self.author
+        )
+        self.other = BlogPost.objects.create(title='Career fair', content='Bring a CV.', author=self.author)
+
+    def test_tokenize_drops_stop_words_and_case(self):
+        self.assertEqual(search.tokenize('The BITSA Hackathon, 2025!'), ['bitsa', 'hackathon', '2025'])
+
+    def test_save_indexes_and_search_ranks_title_first(self):
+        results = list(search.search(BlogPost.objects.all(), 'hackathon').order_by('-search_rank'))
+        self.assertEqual(results, [self.title_match, self.body_match])
+
+    def test_all_terms_must_match(self):
+        results = search.search(BlogPost.objects.all(), 'hackathon late')
+        self.assertEqual(list(results), [self.body_match])
+
+    def test_update_and_delete_refresh_index(self):
+        self.other.title = 'Hackathon career fair'
+        self.other.save()
+        self.assertIn(self.other, search.search(BlogPost.objects.all(), 'hackathon'))
+
+        pk = self.other.pk
+        self.other.delete()
+        self.assertFalse(SearchTerm.objects.filter(object_id=pk, term='career').exists())
+
+    def test_postgres_rank_is_double_precision(self):
+        # float4 ranks would not survive a keyset cursor's JSON round trip
+        queryset = search.PostgresSearchBackend().search(BlogPost.objects.all(), 'hackathon')
+        rank = queryset.query.annotations['search_rank']
+        self.assertIsInstance(rank, Cast)
+        self.assertIsInstance(rank.output_field, models.FloatField)
+        self.assertIsInstance(rank.source_expressions[0], SearchRank)
+
+    def test_models_are_indexed_separately(self):
+        Event.objects.create(
+            title='Hackathon', description='Desc', organizer=self.author, start_time=timezone.now()
+        )
+        self.assertEqual(search.search(BlogPost.objects.all(), 'hackathon').count(), 2)
+        self.assertEqual(search.search(Event.objects.all(), 'hackathon').count(), 1)
+
+
+@override_settings(API_MAX_PAGE_SIZE=3)
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        organizer = User.objects.create(username='organizer')
+        start = timezone.now()
+        # two events share a start time to exercise the id tie-break
+        self.events = [
+            Event.objects.create(
+                title=f'Event {i}', description='Desc', organizer=organizer,
+                start_time=start + timedelta(days=min(i, 3)),
+            )
+            for i in range(5)
+        ]
+
+    def walk(self, url, params=None):
+        titles, pages = [], []
+        response = self.client.get(url, params)
+        while True:
+            pages.append(response.data)
+            titles.extend(item.get('title') for item in response.data['results'])
+            if not response.data['next']:
+                return titles, pages
+            response = self.client.get(response.data['next'])
+
+    def test_unpaginated_without_page_params(self):
+        response = self.client.get('/events/')
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+    def test_next_links_visit_every_row_once_in_order(self):
+        titles, pages = self.walk('/events/', {'page_size': 2})
+        self.assertEqual(titles, ['Event 4', 'Event 3', 'Event 2', 'Event 1', 'Event 0'])
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get('/events/', {'page_size': 2}).data
+        second = self.client.get(first['next']).data
+        back = self.client.get(second['previous']).data
+        self.assertEqual(back['results'], first['results'])
+
+    def test_cached_pages_are_not_shared_across_hosts(self):
+        poisoned = self.client.get('/events/', {'page_size': 2}, HTTP_HOST='evil.example').data
+        self.assertTrue(poisoned['next'].startswith('http://evil.example/'))
+        for secure, prefix in ((False, 'http://testserver/'), (True, 'https://testserver/')):
+            response = self.client.get('/events/', {'page_size': 2}, secure=secure)
+            self.assertTrue(json.loads(response.content)['next'].startswith(prefix))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get('/events/', {'page_size': 50})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get('/events/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_users_endpoint_is_paginated(self):
+        admin = User.objects.create(username='admin', is_staff=True)
+        self.client.force_authenticate(admin)
+        _, pages = self.walk('/api/auth/users/', {'page_size': 1})
+        self.assertEqual(len(pages), 2)
+
+
+class ConnectionBenchmarkTests(TestCase):
+    def test_reports_latency_per_mode(self):
+        out = StringIO()
+        call_command('benchmark_db_connections', requests=5, modes='fresh,persistent', json=True, stdout=out)
+        results = json.loads(out.getvalue())
+        self.assertEqual(set(results), {'fresh', 'persistent'})
+        self.assertEqual(results['persistent']['connects'], 1)
+        self.assertEqual(results['fresh']['requests'], 5)
+
+
+@override_settings(REQUEST_METRICS_HEADER=True)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.client = APIClient()
+        self.organizer = User.objects.create(username='organizer')
+        Event.objects.create(title='Hack', description='Desc', organizer=self.organizer, start_time=timezone.now())
+
+    def test_server_timing_reports_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/events/', {'fields': 'id'})
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;dur=[\d.]+;desc="%d queries", serialize;dur=[\d.]+, render;dur=[\d.]+, total;dur=[\d.]+$' % len(queries),
+        )
+
+    async def test_queries_are_counted_under_asgi(self):
+        # async views and the async ORM run their queries in other threads than the middleware
+        for path in ('/events/', '/api/auth/stats/'):
+            response = await self.async_client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+    def test_serialization_is_timed_apart_from_sql(self):
+        with mock.patch('events.serializers.EventListSerializer.to_representation', side_effect=lambda event: time.sleep(0.02) or {}):
+            response = self.client.get('/events/')
+        timings = dict(re.findall(r'(\w+);dur=([\d.]+)', response['Server-Timing']))
+        self.assertGreaterEqual(float(timings['serialize']), 20)
+        self.assertLess(float(timings['render']), 20)
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_password_hashing_views_are_exempt_from_the_time_threshold(self):
+        User.objects.create_user(username='member', password='secret-pass')
+        with self.assertNoLogs('core.metrics', 'WARNING'):
+            self.client.post('/api/auth/login/', {'username': 'member', 'password': 'secret-pass'}, format='json')
+        with self.assertLogs('core.metrics', 'WARNING'):
+            self.client.get('/events/', {'fields': 'id'})
+
+    @override_settings(SLOW_REQUEST_QUERIES=1)
+    def test_slow_requests_are_logged_and_summarised(self):
+        with self.assertLogs('core.metrics', 'WARNING') as logs:
+            self.client.get('/events/', {'fields': 'id'})
+        self.assertIn('Slow request GET /events/?fields=id', logs.output[0])
+
+        self.client.force_authenticate(User.objects.create(username='admin', is_staff=True))
+        rows = {row['endpoint']: row for row in self.client.get('/api/metrics/').data}
+        self.assertEqual(rows['GET event-list']['requests'], 1)
+        self.assertGreaterEqual(rows['GET event-list']['max_queries'], 1)
+
+        self.client.force_authenticate(self.organizer)
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+
+class AsyncReadViewTests(TestCase):
+    """The async views (see core.async_views) must answer exactly like the sync ones."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.factory = AsyncRequestFactory()
+        self.organizer = User.objects.create(username='organizer', first_name='Org')
+        self.event = Event.objects.create(title='Hack', description='Desc', organizer=self.organizer, start_time=timezone.now())
+        self.event_list = EventViewSet.as_async_view({'get': 'list', 'post': 'create'})
+        self.event_detail = EventViewSet.as_async_view({'get': 'retrieve'})
+
+    def sync_get(self, path, **headers):
+        response = self.client.get(path, headers=headers)
+        cache.clear()
+        return response
+
+    async def test_list_and_detail_match_sync_views(self):
+        expected_list = await sync_to_async(self.sync_get)('/events/')
+        expected_detail = await sync_to_async(self.sync_get)(f'/events/{self.event.pk}/')
+
+        response = await self.event_list(self.factory.get('/events/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), json.loads(expected_list.content))
+        self.assertEqual(response['ETag'], expected_list['ETag'])
+
+        response = await self.event_detail(self.factory.get(f'/events/{self.event.pk}/'), pk=self.event.pk)
+        self.assertEqual(json.loads(response.content), json.loads(expected_detail.content))
+        self.assertEqual(response['ETag'], expected_detail['ETag'])
+
+        response = await self.event_detail(self.factory.get('/events/0/'), pk=0)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_anonymous_list_is_cached_and_revalidated(self):
+        first = await self.event_list(self.factory.get('/events/'))
+        # a queryset update sends no signal, so the cached response is still served
+        await Event.objects.filter(pk=self.event.pk).aupdate(title='Renamed')
+        cached = await self.event_list(self.factory.get('/events/'))
+        self.assertEqual(cached.content, first.content)
+
+        await cache.aclear()
+        response = await self.event_list(self.factory.get('/events/', headers={'If-None-Match': first['ETag']}))
+        self.assertEqual(response.status_code, 304)
+        response = await self.event_list(self.factory.get('/events/'))
+        self.assertEqual(json.loads(response.content)[0]['title'], 'Renamed')
+
+    async def test_bearer_token_is_authenticated(self):
+        staff = await User.objects.acreate(username='staff', is_staff=True)
+        draft = await BlogPost.objects.acreate(title='Draft', content='Not yet.', author=staff)
+        view = BlogPostViewSet.as_async_view({'get': 'list'})
+        token = str(RefreshToken.for_user(staff).access_token)
+
+        anonymous = json.loads((await view(self.factory.get('/api/blogs/posts/'))).content)
+        self.assertEqual(anonymous, [])
+        response = await view(self.factory.get('/api/blogs/posts/', headers={'Authorization': f'Bearer {token}'}))
+        self.assertEqual([post['id'] for post in json.loads(response.content)], [draft.pk])
+
+        response = await view(self.factory.get('/api/blogs/posts/', headers={'Authorization': 'Bearer garbage'}))
+        self.assertEqual(response.status_code, 401)
+
+    async def test_writes_go_to_the_sync_view(self):
+        response = await self.event_list(self.factory.post('/events/', {'title': 'New'}, content_type='application/json'))
+        self.assertEqual(response.status_code, 401)
+
+    async def test_platform_stats(self):
+        response = await account_stats(self.factory.get('/api/auth/stats/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['active_members'], 1)
+        self.assertEqual((await account_stats(self.factory.post('/api/auth/stats/'))).status_code, 405)
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_DELIVERY='python')
+class MediaDeliveryTests(TestCase):
+    body = bytes(range(256)) * 4
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(MEDIA_ROOT, 'gallery', 'variants'), exist_ok=True)
+        for name in ('gallery/photo.jpg', 'gallery/variants/photo-0123456789ab-320w.webp'):
+            with open(os.path.join(MEDIA_ROOT, name), 'wb') as handle:
+                handle.write(cls.body)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_full_response_and_revalidation(self):
+        response = self.client.get('/media/gallery/photo.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.getvalue(), self.body)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+
+        response = self.client.get('/media/gallery/photo.jpg', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_ranges(self):
+        response = self.client.get('/media/gallery/photo.jpg', headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.getvalue(), self.body[10:20])
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(response['Content-Length'], '10')
+
+        response = self.client.get('/media/gallery/photo.jpg', headers={'Range': 'bytes=-24'})
+        self.assertEqual(response.getvalue(), self.body[-24:])
+
+        response = self.client.get('/media/gallery/photo.jpg', headers={'Range': 'bytes=2000-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+        # a stale If-Range gets the whole (changed) file instead of a piece of it
+        response = self.client.get('/media/gallery/photo.jpg', headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+
+    async def test_asgi_streams_chunks_instead_of_buffering(self):
+        with mock.patch('core.media.CHUNK_SIZE', 256):
+            response = await self.async_client.get('/media/gallery/photo.jpg')
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(b''.join(chunks), self.body)
+        self.assertEqual(response['Content-Length'], '1024')
+        self.assertNotIn('Content-Range', response)
+
+        response = await self.async_client.get('/media/gallery/photo.jpg', headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), self.body[10:20])
+
+    def test_hashed_names_are_immutable(self):
+        response = self.client.get('/media/gallery/variants/photo-0123456789ab-320w.webp')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['ETag'], '"0123456789ab"')
+
+    def test_missing_files_and_traversal_are_not_found(self):
+        self.assertEqual(self.client.get('/media/gallery/missing.jpg').status_code, 404)
+        self.assertEqual(self.client.get('/media/gallery/').status_code, 404)
+        self.assertEqual(self.client.get('/media/../settings.py').status_code, 404)
+        self.assertEqual(self.client.post('/media/gallery/photo.jpg').status_code, 405)
+
+    @override_settings(MEDIA_DELIVERY='x-accel-redirect', MEDIA_ACCEL_PREFIX='/protected-media/')
+    def test_x_accel_redirect_hands_off_to_the_proxy(self):
+        response = self.client.get('/media/gallery/variants/photo-0123456789ab-320w.webp')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/gallery/variants/photo-0123456789ab-320w.webp')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertEqual(response.content, b'')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    @override_settings(MEDIA_DELIVERY='x-sendfile')
+    def test_x_sendfile_hands_off_to_the_proxy(self):
+        response = self.client.get('/media/gallery/photo.jpg')
+        self.assertEqual(response['X-Sendfile'], os.path.join(MEDIA_ROOT, 'gallery', 'photo.jpg'))
+        self.assertEqual(response.content, b'')
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import constants, metrics
+
+urlpatterns = [
+    path('constants/', constants.constant_index, name='constant-index'),
+    path('constants/<slug:name>/', constants.constant_current, name='constant-current'),
+    path('constants/<slug:name>/<str:version>/', constants.constant_version, name='constant-version'),
+    path('metrics/', metrics.metrics_summary, name='request-metrics'),
+]
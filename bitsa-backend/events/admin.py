@@ -1,13 +1,20 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.db.models import Sum
+from django.db.models.functions import Now
+from django.shortcuts import get_object_or_404
+from django.urls import path
 from django.utils.html import format_html
+from core.response_cache import bump_generation
+from .exports import attendee_export_response
 from .models import Event
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ('title', 'organizer', 'location', 'start_time', 'is_public', 'capacity', 'attendees_count', 'image_preview')
+    list_display = ('title', 'organizer', 'location', 'start_time', 'is_public', 'capacity', 'attendee_count', 'image_preview')
     list_filter = ('is_public', 'start_time', 'organizer')
     search_fields = ('title', 'description', 'organizer__username', 'organizer__email', 'location')
-    readonly_fields = ('created_at', 'updated_at', 'attendees_count',)
+    readonly_fields = ('created_at', 'updated_at', 'attendee_count',)
     ordering = ('-start_time',)
     list_per_page = 25
 
@@ -21,7 +28,7 @@ class EventAdmin(admin.ModelAdmin):
         ('Timestamps', {'fields': ('created_at', 'updated_at'), 'classes': ('collapse',)}),
     )
 
-    actions = ['make_public', 'make_private', 'export_attendees']
+    actions = ['make_public', 'make_private', 'export_attendees', 'count_attendees']
 
     def image_preview(self, obj):
         if obj.image:
@@ -29,29 +36,53 @@ class EventAdmin(admin.ModelAdmin):
         return "(no image)"
     image_preview.short_description = 'Image'
 
+    def _set_public(self, queryset, is_public):
+        # update() sends no post_save: refresh updated_at (ETags) and drop cached responses by hand
+        updated = queryset.update(is_public=is_public, updated_at=Now())
+        bump_generation(Event._meta.label_lower)
+        return updated
+
     def make_public(self, request, queryset):
-        updated = queryset.update(is_public=True)
+        updated = self._set_public(queryset, True)
         self.message_user(request, f"{updated} event(s) made public.")
     make_public.short_description = "Make selected events public"
 
     def make_private(self, request, queryset):
-        updated = queryset.update(is_public=False)
+        updated = self._set_public(queryset, False)
         self.message_user(request, f"{updated} event(s) made private.")
     make_private.short_description = "Make selected events private"
 
     def export_attendees(self, request, queryset):
-        """
-        Minimal action: tell admin how many attendees selected events have.
-        For full CSV export, implement streaming response in a custom admin view.
-        """
-        total = sum(e.attendees.count() for e in queryset)
+        """Download the attendees of the selected events as a streamed CSV."""
+        return attendee_export_response(request, list(queryset.values_list('pk', flat=True)), 'csv', 'event-attendees')
+    export_attendees.short_description = "Export attendees of selected events (CSV)"
+
+    def count_attendees(self, request, queryset):
+        total = queryset.aggregate(total=Sum('attendee_count'))['total'] or 0
         self.message_user(request, f"Selected events have a total of {total} attendee(s).")
-    export_attendees.short_description = "Show total attendees for selected events"
+    count_attendees.short_description = "Show total attendees for selected events"
+
+    def get_urls(self):
+        urls = [
+            path(
+                '<path:object_id>/export-attendees/',
+                self.admin_site.admin_view(self.export_attendees_view),
+                name='events_event_export_attendees',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def export_attendees_view(self, request, object_id):
+        """Stream one event's attendees; ?output=ndjson for newline-delimited JSON."""
+        event = get_object_or_404(Event, pk=object_id)
+        if not self.has_view_or_change_permission(request, event):
+            raise PermissionDenied
+        output = request.GET.get('output', 'csv')
+        if output not in ('csv', 'ndjson'):
+            output = 'csv'
+        return attendee_export_response(request, [event.pk], output, f"event-{event.pk}-attendees")
 
     def save_model(self, request, obj, form, change):
-        # Debug log the image field status
-        image_field = form.cleaned_data.get('image', None)
-        print(f"Saving Event: {obj.title}, Image Field: {image_field}")
         if not change:
             obj.organizer = request.user
         super().save_model(request, obj, form, change)
@@ -0,0 +1,254 @@
+"""
+Bulk event import and export (CSV or JSON), used by the ``bulk`` API action
+and the ``import_events`` / ``export_events`` management commands.
+
+Imports are validated as a batch: every username referenced by the file is
+resolved in one query, each row is checked with ``EventImportSerializer``
+and all errors are reported by row number. Only a fully valid batch is
+written, with ``bulk_create`` for the events and for the attendee join
+table inside a single transaction. ``attendee_count`` is set directly and
+the search index / caches are refreshed once for the whole batch, since
+bulk_create sends no signals.
+
+Exports use the same columns, so an exported file can be imported again.
+Like the attendee exports (see events.exports) they are streamed, through an
+async iterator under ASGI.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import serializers
+
+from core import search, stats
+from core.async_views import streaming_content
+from core.response_cache import bump_generation
+from core.streaming import Echo, chunked
+from .models import Event
+
+COLUMNS = (
+    'title', 'description', 'location', 'category', 'start_time', 'end_time',
+    'is_public', 'capacity', 'organizer', 'attendees',
+)
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'json': 'application/json',
+}
+
+# CSV cells holding several usernames separate them with this character
+LIST_SEPARATOR = ';'
+BATCH_SIZE = 500
+
+
+class UsernameListField(serializers.ListField):
+    """A list of usernames, also accepted as a ``;``-separated string (CSV)."""
+
+    child = serializers.CharField()
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [name.strip() for name in data.split(LIST_SEPARATOR) if name.strip()]
+        return super().to_internal_value(data)
+
+
+class EventImportSerializer(serializers.Serializer):
+    """
+    One imported row. ``start_time`` may also be given as separate ``date``
+    and ``time`` columns, as the regular create endpoint accepts.
+    Usernames are resolved against ``context['users']`` ({username: id}).
+    """
+
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField(allow_blank=True, required=False, default='')
+    location = serializers.CharField(max_length=255, allow_blank=True, required=False, default='')
+    category = serializers.CharField(max_length=50, required=False, default='hackathon')
+    start_time = serializers.DateTimeField(required=False)
+    date = serializers.DateField(required=False, write_only=True)
+    time = serializers.TimeField(required=False, write_only=True)
+    end_time = serializers.DateTimeField(required=False, allow_null=True, default=None)
+    is_public = serializers.BooleanField(required=False, default=True)
+    capacity = serializers.IntegerField(min_value=0, required=False, allow_null=True, default=None)
+    organizer = serializers.CharField(required=False, allow_blank=True)
+    attendees = UsernameListField(required=False, default=list)
+
+    def to_internal_value(self, data):
+        # CSV leaves unused columns as empty strings; treat them as missing
+        data = {key: value for key, value in data.items() if value not in ('', None) or key == 'description'}
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        date, time = attrs.pop('date', None), attrs.pop('time', None)
+        if 'start_time' not in attrs:
+            if not (date and time):
+                raise serializers.ValidationError({'start_time': 'Give start_time, or both date and time.'})
+            attrs['start_time'] = timezone.make_aware(datetime.combine(date, time))
+        if attrs['end_time'] and attrs['end_time'] < attrs['start_time']:
+            raise serializers.ValidationError({'end_time': 'End time is before the start time.'})
+
+        users = self.context['users']
+        organizer = attrs.pop('organizer', None)
+        if organizer:
+            if organizer not in users:
+                raise serializers.ValidationError({'organizer': f'Unknown user {organizer!r}.'})
+            attrs['organizer_id'] = users[organizer]
+        else:
+            attrs['organizer_id'] = self.context['default_organizer'].pk
+
+        unknown = [name for name in attrs['attendees'] if name not in users]
+        if unknown:
+            raise serializers.ValidationError({'attendees': f"Unknown user(s): {', '.join(unknown)}."})
+        attrs['attendees'] = list(dict.fromkeys(users[name] for name in attrs['attendees']))
+        if attrs['capacity'] is not None and len(attrs['attendees']) > attrs['capacity']:
+            raise serializers.ValidationError({'attendees': 'More attendees than the event capacity.'})
+        return attrs
+
+
+def parse(content, fmt):
+    """Rows (dicts) from CSV text or a JSON list / ``{"events": [...]}`` document."""
+    if fmt == 'csv':
+        return list(csv.DictReader(io.StringIO(content)))
+    data = json.loads(content) if isinstance(content, str) else content
+    if isinstance(data, dict):
+        data = data.get('events')
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise ValueError('Expected a JSON list of event objects.')
+    return data
+
+
+def _referenced_usernames(rows):
+    names = set()
+    for row in rows:
+        if row.get('organizer'):
+            names.add(str(row['organizer']).strip())
+        attendees = row.get('attendees') or []
+        if isinstance(attendees, str):
+            attendees = attendees.split(LIST_SEPARATOR)
+        names.update(str(name).strip() for name in attendees if str(name).strip())
+    return names
+
+
+def validate_rows(rows, default_organizer):
+    """Return (validated rows, errors); errors are ``{'row': n, 'errors': {...}}``, 1-based."""
+    users = dict(User.objects.filter(username__in=_referenced_usernames(rows)).values_list('username', 'id'))
+    context = {'users': users, 'default_organizer': default_organizer}
+    valid, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        serializer = EventImportSerializer(data=row, context=context)
+        if serializer.is_valid():
+            valid.append(serializer.validated_data)
+        else:
+            errors.append({'row': number, 'errors': serializer.errors})
+    return valid, errors
+
+
+def create_events(rows):
+    """Insert validated rows and their attendees; returns the new events."""
+    Attendance = Event.attendees.through
+    with transaction.atomic():
+        events = Event.objects.bulk_create(
+            [
+                Event(**{key: value for key, value in row.items() if key != 'attendees'},
+                      attendee_count=len(row['attendees']))
+                for row in rows
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Attendance.objects.bulk_create(
+            [
+                Attendance(event_id=event.pk, user_id=user_id)
+                for event, row in zip(events, rows)
+                for user_id in row['attendees']
+            ],
+            batch_size=BATCH_SIZE * 4,
+        )
+        search.index_objects(Event, [event.pk for event in events])
+
+    stats.invalidate_platform_stats()
+    bump_generation(Event._meta.label_lower)
+    return events
+
+
+def import_events(rows, default_organizer, dry_run=False):
+    """
+    Validate ``rows`` and, if all of them are valid and ``dry_run`` is off,
+    create them. Returns ``{'created': n, 'ids': [...], 'errors': [...]}``.
+    """
+    valid, errors = validate_rows(rows, default_organizer)
+    if errors or dry_run:
+        return {'created': 0, 'ids': [], 'errors': errors}
+    events = create_events(valid)
+    return {'created': len(events), 'ids': [event.pk for event in events], 'errors': []}
+
+
+def event_rows(queryset, chunk_size=BATCH_SIZE):
+    """Export rows for ``queryset``; attendees are loaded per chunk of events."""
+    events = queryset.select_related('organizer').order_by('pk').iterator(chunk_size=chunk_size)
+    chunk = []
+    for event in events:
+        chunk.append(event)
+        if len(chunk) >= chunk_size:
+            yield from _export_chunk(chunk)
+            chunk = []
+    if chunk:
+        yield from _export_chunk(chunk)
+
+
+def _export_chunk(events):
+    attendees = {}
+    pairs = (
+        Event.attendees.through.objects
+        .filter(event_id__in=[event.pk for event in events])
+        .order_by('event_id', 'user__username')
+        .values_list('event_id', 'user__username')
+    )
+    for event_id, username in pairs:
+        attendees.setdefault(event_id, []).append(username)
+
+    for event in events:
+        yield {
+            'title': event.title,
+            'description': event.description,
+            'location': event.location,
+            'category': event.category,
+            'start_time': event.start_time.isoformat(),
+            'end_time': event.end_time.isoformat() if event.end_time else None,
+            'is_public': event.is_public,
+            'capacity': event.capacity,
+            'organizer': event.organizer.username,
+            'attendees': attendees.get(event.pk, []),
+        }
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        row = dict(row, attendees=LIST_SEPARATOR.join(row['attendees']))
+        yield writer.writerow([row[column] for column in COLUMNS])
+
+
+def json_lines(rows):
+    yield '['
+    for index, row in enumerate(rows):
+        yield (',' if index else '') + json.dumps(row, ensure_ascii=False)
+    yield ']'
+
+
+def export_lines(queryset, output):
+    if output not in CONTENT_TYPES:
+        raise ValueError(f"Unsupported export format: {output}")
+    lines = csv_lines if output == 'csv' else json_lines
+    return chunked(lines(event_rows(queryset)))
+
+
+def event_export_response(request, queryset, output='csv', filename='events'):
+    content = streaming_content(request, export_lines(queryset, output))
+    response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[output])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from events import bulk
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Export every event with its attendee usernames as CSV or JSON (re-importable with import_events)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', choices=list(bulk.CONTENT_TYPES), default='csv')
+        parser.add_argument('--file', help='Write to this path instead of stdout')
+
+    def handle(self, *args, **options):
+        chunks = bulk.export_lines(Event.objects.all(), options['output'])
+        if not options['file']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['file'], 'w', encoding='utf-8', newline='') as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Events written to {options['file']}"))
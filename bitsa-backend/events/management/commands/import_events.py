@@ -0,0 +1,49 @@
+import json
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from events import bulk
+
+
+class Command(BaseCommand):
+    help = "Import events (with attendee usernames) from a CSV or JSON file in one transaction."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file to import')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Defaults to the file extension')
+        parser.add_argument('--organizer', help='Username used for rows without an organizer column')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate the file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.lower().endswith('.csv') else 'json')
+        organizer = None
+        if options['organizer']:
+            organizer = User.objects.filter(username=options['organizer']).first()
+            if organizer is None:
+                raise CommandError(f"Unknown organizer {options['organizer']!r}")
+
+        if not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+        with open(path, encoding='utf-8-sig', newline='') as handle:
+            try:
+                rows = bulk.parse(handle.read(), fmt)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+
+        missing = [n for n, row in enumerate(rows, start=1) if not row.get('organizer')]
+        if missing and organizer is None:
+            raise CommandError(f"Rows {missing[:10]} have no organizer; pass --organizer")
+
+        result = bulk.import_events(rows, organizer, dry_run=options['dry_run'])
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        if result['errors']:
+            raise CommandError(f"{len(result['errors'])} invalid row(s); nothing was imported.")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"All {len(rows)} row(s) are valid."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Imported {result['created']} event(s)."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F
+
+from events.models import Event
+from events.signals import refresh_attendee_counts
+
+
+class Command(BaseCommand):
+    help = "Find events whose denormalised attendee_count drifted from the attendee table and fix them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report drifted events, do not update them'
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            Event.objects
+            .annotate(actual=Count('attendees'))
+            .exclude(actual=F('attendee_count'))
+            .values_list('pk', 'title', 'attendee_count', 'actual')
+        )
+
+        ids = []
+        for pk, title, stored, actual in drifted:
+            ids.append(pk)
+            self.stdout.write(f"Event {pk} ({title}): stored {stored}, actual {actual}")
+
+        if not ids:
+            self.stdout.write(self.style.SUCCESS("All attendee counts are in sync."))
+            return
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"{len(ids)} event(s) drifted (dry run, nothing changed)."))
+            return
+
+        refresh_attendee_counts(ids)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled attendee counts for {len(ids)} event(s)."))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_attendee_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    totals = (
+        Event.attendees.through.objects
+        .filter(event_id=OuterRef('pk'))
+        .order_by()
+        .values('event_id')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Event.objects.update(attendee_count=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendee_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalised number of attendees (kept in sync by events.signals)'),
+        ),
+        migrations.RunPython(backfill_attendee_count, migrations.RunPython.noop),
+    ]
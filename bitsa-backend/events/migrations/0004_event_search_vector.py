@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+import core.migration_operations
+
+
+def populate_search_vector(apps, schema_editor):
+    # tsvector only exists on PostgreSQL; other databases use core.SearchTerm
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Event = apps.get_model('events', 'Event')
+    Event.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('location', weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_attendee_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        core.migration_operations.AddPostgresIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='events_event_search_gin'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,61 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+class EventQuerySet(models.QuerySet):
+    """
+    Event status in SQL, mirroring ``Event.status``: completed once
+    ``end_time`` has passed, ongoing from ``start_time`` on (indefinitely when
+    there is no end time), upcoming before that.
+    """
+
+    @staticmethod
+    def status_q(status, now=None):
+        """Filter for one status, on the raw columns so the start_time index applies."""
+        now = now or timezone.now()
+        if status == 'completed':
+            return models.Q(end_time__lt=now)
+        if status == 'ongoing':
+            return models.Q(start_time__lte=now) & (models.Q(end_time__isnull=True) | models.Q(end_time__gte=now))
+        if status == 'upcoming':
+            return models.Q(start_time__gt=now)
+        raise ValueError(f'Unknown event status {status!r}')
+
+    def with_status(self, now=None):
+        """Annotate ``status`` (read by the model property) and ``status_rank``."""
+        now = now or timezone.now()
+        whens = [(status, self.status_q(status, now)) for status in ('completed', 'ongoing')]
+        return self.annotate(
+            status=models.Case(
+                *[models.When(q, then=models.Value(status)) for status, q in whens],
+                default=models.Value('upcoming'),
+                output_field=models.CharField(),
+            ),
+            status_rank=models.Case(
+                *[models.When(q, then=models.Value(self.model.STATUS_RANKS[status])) for status, q in whens],
+                default=models.Value(self.model.STATUS_RANKS['upcoming']),
+                output_field=models.IntegerField(),
+            ),
+        )
+
+    def filter_status(self, *statuses, now=None):
+        now = now or timezone.now()
+        q = models.Q()
+        for status in statuses:
+            q |= self.status_q(status, now)
+        return self.filter(q)
+
+
 class Event(models.Model):
+    # Fields indexed for ?search= with their ranking weight (see core.search)
+    SEARCH_FIELDS = {'title': 'A', 'location': 'B', 'description': 'C'}
+    STATUSES = ('upcoming', 'ongoing', 'completed')
+    # ?ordering=status: what is happening now first, then what is next, then the past
+    STATUS_RANKS = {'ongoing': 0, 'upcoming': 1, 'completed': 2}
+
     title = models.CharField(max_length=200)
     description = models.TextField()
     organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='organized_events')
@@ -14,22 +66,40 @@ class Event(models.Model):
     is_public = models.BooleanField(default=True)
     capacity = models.PositiveIntegerField(null=True, blank=True, help_text="Maximum number of attendees (optional)")
     attendees = models.ManyToManyField(User, blank=True, related_name='events_attending')
+    attendee_count = models.PositiveIntegerField(default=0, editable=False, help_text="Denormalised number of attendees (kept in sync by events.signals)")
     image = models.ImageField(upload_to='events/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of image (see core.images)")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # PostgreSQL tsvector, GIN-indexed below and refreshed on save
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = EventQuerySet.as_manager()
 
     class Meta:
         ordering = ['-start_time']
+        indexes = [
+            # default ordering plus the pk tie-break used by cursor pagination;
+            # also serves ?upcoming and the yearly stats range scan
+            models.Index(fields=['-start_time', '-id'], name='events_start_time_id_idx'),
+            # ?organizer= and per-organizer listings, already in display order
+            models.Index(fields=['organizer', '-start_time'], name='events_organizer_start_idx'),
+            # ?search= on PostgreSQL; created only there (see migrations)
+            GinIndex(fields=['search_vector'], name='events_event_search_gin'),
+        ]
 
     def __str__(self):
         return self.title
 
     @property
     def attendees_count(self):
-        return self.attendees.count()
+        return self.attendee_count
 
     @property
     def status(self):
+        # computed by the database when loaded through EventQuerySet.with_status()
+        if '_status' in self.__dict__:
+            return self._status
         now = timezone.now()
         start_time = self.start_time
         if timezone.is_naive(start_time):
@@ -45,14 +115,24 @@ class Event(models.Model):
         else:
             return 'upcoming'
 
+    @status.setter
+    def status(self, value):
+        self._status = value
+
     def clean(self):
         # Ensure capacity is not less than current attendees when saving
         if self.capacity is not None and self.pk is not None:
-            current_attendees = self.attendees.count()
-            if self.capacity < current_attendees:
+            if self.capacity < self.attendee_count:
                 raise ValidationError("Capacity cannot be less than current number of attendees.")
 
     def save(self, *args, **kwargs):
         # run clean to enforce capacity constraint
         self.clean()
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # attendee_count is only ever written by SQL updates in events.signals;
+            # never write back a possibly stale in-memory value.
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != 'attendee_count'
+            ]
         super().save(*args, **kwargs)
@@ -1,12 +1,14 @@
 from rest_framework import serializers
+from core.serializers import ImageSrcsetField, SparseFieldsMixin, absolute_url, auto_excerpt
 from .models import Event
 from datetime import datetime
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     organizer_name = serializers.CharField(source='organizer.get_full_name', read_only=True)
     organizer_email = serializers.CharField(source='organizer.email', read_only=True)
     attendees_count = serializers.IntegerField(read_only=True)
     image = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField()
 
     def get_image(self, obj):
         if obj.image:
@@ -22,7 +24,7 @@ class EventSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'description', 'organizer', 'organizer_name', 'organizer_email',
             'location', 'category', 'end_time', 'is_public', 'capacity',
-            'attendees_count', 'status', 'image', 'date', 'time', 'created_at', 'updated_at'
+            'attendees_count', 'status', 'image', 'image_srcset', 'date', 'time', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'organizer', 'attendees_count', 'created_at', 'updated_at']
 
@@ -58,3 +60,28 @@ class EventSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Invalid date or time format")
 
         return super().update(instance, validated_data)
+
+
+class EventListSerializer(EventSerializer):
+    """
+    Compact serializer for list views: ``description`` is replaced by a short
+    plain-text ``excerpt`` built from ``description_preview`` (annotated by the view).
+    """
+
+    excerpt = serializers.SerializerMethodField()
+
+    class Meta(EventSerializer.Meta):
+        fields = [
+            'id', 'title', 'excerpt', 'organizer', 'organizer_name', 'organizer_email',
+            'location', 'category', 'end_time', 'is_public', 'capacity',
+            'attendees_count', 'status', 'image', 'image_srcset', 'date', 'time', 'created_at', 'updated_at'
+        ]
+
+    def get_excerpt(self, obj):
+        preview = getattr(obj, 'description_preview', None)
+        return auto_excerpt(obj.description if preview is None else preview)
+
+    def get_image(self, obj):
+        if obj.image:
+            return absolute_url(self.context.get('request'), obj.image.url)
+        return None
@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Now
+from django.db.models.signals import m2m_changed, pre_delete, post_delete
+from django.dispatch import receiver
+
+from core.response_cache import bump_generation
+from .models import Event
+
+
+def refresh_attendee_counts(event_ids):
+    """
+    Recount attendees for the given events from the join table in a single
+    UPDATE. Recounting (rather than incrementing) keeps the column correct even
+    when add()/remove() are called with users that were already (not) attending.
+    """
+    event_ids = list(event_ids)
+    if not event_ids:
+        return 0
+    totals = (
+        Event.attendees.through.objects
+        .filter(event_id=OuterRef('pk'))
+        .order_by()
+        .values('event_id')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    # update() skips auto_now; updated_at feeds the ETags (see core.conditional)
+    updated = Event.objects.filter(pk__in=event_ids).update(
+        attendee_count=Coalesce(Subquery(totals), 0), updated_at=Now()
+    )
+    bump_generation(Event._meta.label_lower)
+    return updated
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def sync_attendee_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep Event.attendee_count in sync with RSVPs, admin edits and user.events_attending changes."""
+    if reverse and action == 'pre_clear':
+        # user.events_attending.clear(): remember which events lose an attendee
+        instance._cleared_event_ids = list(instance.events_attending.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        event_ids = [instance.pk]
+    elif action == 'post_clear':
+        event_ids = instance.__dict__.pop('_cleared_event_ids', [])
+    else:
+        event_ids = pk_set or []
+    refresh_attendee_counts(event_ids)
+
+
+@receiver(pre_delete, sender=User)
+def remember_attended_events(sender, instance, **kwargs):
+    # Deleting a user cascades to the join table without firing m2m_changed
+    instance._attended_event_ids = list(instance.events_attending.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=User)
+def recount_after_user_delete(sender, instance, **kwargs):
+    refresh_attendee_counts(instance.__dict__.pop('_attended_event_ids', []))
@@ -1,10 +1,23 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase, Client
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from core.testing import QueryPlanAssertionsMixin
 from .models import Event
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
 
 class EventModelTests(TestCase):
     def setUp(self):
@@ -25,6 +38,7 @@ class EventModelTests(TestCase):
 
 class EventViewSetTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
 
         self.organizer = User.objects.create_user(username='organizer', password='pass')
@@ -106,3 +120,385 @@ class EventViewSetTests(TestCase):
         response = self.client.patch(self.unpublish_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.client.logout()
+
+    def test_list_query_count_does_not_grow_with_events(self):
+        for i in range(5):
+            event = Event.objects.create(
+                title=f'Event {i}',
+                description='Desc',
+                organizer=User.objects.create_user(username=f'org{i}', password='pass'),
+                start_time=timezone.now() + timedelta(days=i + 2),
+            )
+            event.attendees.add(self.regular_user, self.staff_user)
+
+        # one aggregate for the ETag (see ConditionalGetMixin) and one for the rows
+        with self.assertNumQueries(2):
+            response = self.client.get('/events/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {item['title']: item['attendees_count'] for item in response.data}
+        self.assertEqual(counts['Event 0'], 2)
+        self.assertEqual(counts['Test Event'], 0)
+
+    def test_list_returns_excerpt_instead_of_description(self):
+        response = self.client.get('/events/')
+        row = response.data[0]
+        self.assertNotIn('description', row)
+        self.assertEqual(row['excerpt'], self.event.description)
+
+        detail = self.client.get(f'/events/{self.event.pk}/', {'fields': 'id,description'})
+        self.assertEqual(set(detail.data), {'id', 'description'})
+
+    def test_my_events_counts_all_attendees(self):
+        self.event.attendees.add(self.regular_user, self.organizer)
+        self.client.force_authenticate(self.regular_user)
+        response = self.client.get('/events/my-events/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['attendees_count'], 2)
+
+    def test_rsvp_query_count_independent_of_attendees(self):
+        self.event.capacity = None
+        self.event.save()
+        others = [User.objects.create(username=f'attendee{i}') for i in range(20)]
+        self.event.attendees.add(*others)
+        self.client.force_authenticate(self.regular_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.rsvp_url)
+        self.assertEqual(response.data['status'], 'added')
+        self.assertLessEqual(len(queries), 8)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.rsvp_url)
+        self.assertEqual(response.data['status'], 'removed')
+        self.assertLessEqual(len(queries), 8)
+        self.assertEqual(self.event.attendees.count(), 20)
+
+    def test_rsvp_respects_capacity_under_lock(self):
+        self.event.attendees.add(self.organizer, self.staff_user)
+        self.client.force_authenticate(self.regular_user)
+        response = self.client.post(self.rsvp_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(self.event.attendees.filter(pk=self.regular_user.pk).exists())
+
+
+class AttendeeCountSyncTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create(username='organizer')
+        self.users = [User.objects.create(username=f'user{i}') for i in range(3)]
+        self.event = Event.objects.create(
+            title='Counted Event',
+            description='Desc',
+            organizer=self.organizer,
+            start_time=timezone.now() + timedelta(days=1),
+            capacity=3,
+        )
+
+    def stored_count(self):
+        return Event.objects.values_list('attendee_count', flat=True).get(pk=self.event.pk)
+
+    def test_add_remove_and_clear_update_counter(self):
+        self.event.attendees.add(*self.users)
+        self.assertEqual(self.stored_count(), 3)
+        self.event.attendees.remove(self.users[0])
+        self.assertEqual(self.stored_count(), 2)
+        self.event.attendees.set([self.users[0]])
+        self.assertEqual(self.stored_count(), 1)
+        self.event.attendees.clear()
+        self.assertEqual(self.stored_count(), 0)
+
+    def test_reverse_side_and_user_delete_update_counter(self):
+        self.users[0].events_attending.add(self.event)
+        self.users[1].events_attending.add(self.event)
+        self.assertEqual(self.stored_count(), 2)
+        self.users[0].events_attending.clear()
+        self.assertEqual(self.stored_count(), 1)
+        self.users[1].delete()
+        self.assertEqual(self.stored_count(), 0)
+
+    def test_save_does_not_overwrite_counter(self):
+        self.event.attendees.add(*self.users[:2])
+        self.event.title = 'Renamed'
+        self.event.save()  # in-memory attendee_count is stale (0)
+        self.assertEqual(self.stored_count(), 2)
+
+    def test_reconcile_command_fixes_drift(self):
+        self.event.attendees.add(*self.users)
+        Event.objects.filter(pk=self.event.pk).update(attendee_count=7)
+        call_command('reconcile_attendee_counts', stdout=StringIO())
+        self.assertEqual(self.stored_count(), 3)
+
+    def test_available_filter_and_fill_level_ordering(self):
+        self.event.attendees.add(*self.users)
+        open_event = Event.objects.create(
+            title='Open Event',
+            description='Desc',
+            organizer=self.organizer,
+            start_time=timezone.now() + timedelta(days=2),
+            capacity=10,
+        )
+        open_event.attendees.add(self.users[0])
+        client = APIClient()
+
+        response = client.get('/events/', {'available': 'true'})
+        self.assertEqual([e['title'] for e in response.data], ['Open Event'])
+
+        response = client.get('/events/', {'ordering': '-fill_level'})
+        self.assertEqual([e['title'] for e in response.data], ['Counted Event', 'Open Event'])
+
+
+    def test_attendee_count_and_status_changes_update_etags(self):
+        cache.clear()
+        client = APIClient()
+        detail_url = f'/events/{self.event.pk}/'
+        detail, listing = client.get(detail_url), client.get('/events/')
+
+        # RSVPs change attendee_count with an UPDATE, not save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.attendees.add(self.users[0])
+        for url, response in ((detail_url, detail), ('/events/', listing)):
+            fresh = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(fresh.status_code, status.HTTP_200_OK)
+        detail, listing = client.get(detail_url), client.get('/events/')
+        self.assertEqual(json.loads(detail.content)['attendees_count'], 1)
+
+        # once the event starts, its status changes without any write
+        cache.clear()
+        later = timezone.now() + timedelta(days=1, hours=1)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            for url, response in ((detail_url, detail), ('/events/', listing)):
+                fresh = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(fresh.status_code, status.HTTP_200_OK)
+                self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=fresh['ETag']).status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class EventAdminActionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username='admin', password='x')
+        self.event = Event.objects.create(
+            title='Toggled Event',
+            description='Desc',
+            organizer=self.admin,
+            start_time=timezone.now() + timedelta(days=1),
+        )
+
+    def test_visibility_actions_invalidate_cached_lists(self):
+        api = APIClient()
+        self.assertTrue(json.loads(api.get('/events/').content)[0]['is_public'])
+
+        self.client.force_login(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/admin/events/event/', {'action': 'make_private', '_selected_action': [self.event.pk]})
+        self.assertFalse(Event.objects.get(pk=self.event.pk).is_public)
+        self.assertFalse(json.loads(api.get('/events/').content)[0]['is_public'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/admin/events/event/', {'action': 'make_public', '_selected_action': [self.event.pk]})
+        self.assertTrue(json.loads(api.get('/events/').content)[0]['is_public'])
+
+
+class AttendeeExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create(username='admin', is_staff=True)
+        organizer = User.objects.create(username='organizer')
+        self.events = [
+            Event.objects.create(title=f'Hack {i}', description='Desc', organizer=organizer, start_time=timezone.now())
+            for i in range(2)
+        ]
+        self.attendees = [
+            User.objects.create(username=f'student{i}', email=f'student{i}@example.com', first_name='Student')
+            for i in range(3)
+        ]
+        self.events[0].attendees.add(*self.attendees)
+        self.events[1].attendees.add(self.attendees[0])
+
+    def content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export_for_one_event(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(f'/events/{self.events[0].pk}/attendees/export/')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = self.content(response).splitlines()
+        self.assertEqual(lines[0], 'event_id,event_title,user_id,username,email,first_name,last_name')
+        self.assertEqual(len(lines), 4)
+        self.assertIn('student2@example.com', lines[3])
+
+    def test_ndjson_export_for_several_events(self):
+        self.client.force_authenticate(self.admin)
+        ids = ','.join(str(e.pk) for e in self.events)
+        response = self.client.get('/events/export-attendees/', {'events': ids, 'output': 'ndjson'})
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[-1]['event_title'], 'Hack 1')
+
+    async def test_asgi_exports_stream_through_an_async_iterator(self):
+        token = await sync_to_async(lambda: str(AccessToken.for_user(self.admin)))()
+        headers = {'Authorization': f'Bearer {token}'}
+        for url, params in ((f'/events/{self.events[0].pk}/attendees/export/', {}), ('/events/bulk/', {'output': 'json'})):
+            response = await self.async_client.get(url, params, headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.is_async)
+            content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+            self.assertIn('student2', content)
+
+    def test_export_is_admin_only(self):
+        self.client.force_authenticate(self.attendees[0])
+        response = self.client.get(f'/events/{self.events[0].pk}/attendees/export/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(f'/events/{self.events[0].pk}/attendees/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class EventIndexTests(QueryPlanAssertionsMixin, TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='org', password='pass')
+        for i in range(3):
+            Event.objects.create(title=f'Event {i}', description='Desc', organizer=self.organizer,
+                                 start_time=timezone.now() + timedelta(days=i))
+
+    def test_listing_and_upcoming_use_start_time_index(self):
+        self.assertUsesIndex(Event.objects.order_by('-start_time', '-id'), 'events_start_time_id_idx')
+        upcoming = Event.objects.filter(start_time__gte=timezone.now()).order_by('-start_time')
+        self.assertUsesIndex(upcoming, 'events_start_time_id_idx')
+
+    def test_organizer_filter_uses_composite_index(self):
+        qs = Event.objects.filter(organizer=self.organizer).order_by('-start_time')
+        self.assertUsesIndex(qs, 'events_organizer_start_idx')
+
+
+class EventBulkTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create(username='admin', is_staff=True)
+        self.students = [User.objects.create(username=f'student{i}') for i in range(3)]
+        self.client.force_authenticate(self.admin)
+
+    def rows(self, count):
+        return [
+            {
+                'title': f'Workshop {i}', 'description': 'Desc', 'date': '2030-02-01', 'time': '09:30',
+                'capacity': 5, 'attendees': ['student0', 'student1'],
+            }
+            for i in range(count)
+        ]
+
+    def test_json_import_creates_events_and_attendees(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.post('/events/bulk/', self.rows(2), format='json')
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.post('/events/bulk/', self.rows(20), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 20)
+        event = Event.objects.get(pk=response.data['ids'][0])
+        self.assertEqual(event.organizer, self.admin)
+        self.assertEqual(event.attendee_count, 2)
+        self.assertEqual(set(event.attendees.values_list('username', flat=True)), {'student0', 'student1'})
+        # batched: the number of queries does not depend on the number of rows
+        self.assertEqual(len(many), len(few))
+
+    def test_csv_import_reports_errors_per_row_and_saves_nothing(self):
+        body = (
+            'title,start_time,capacity,organizer,attendees\n'
+            'Good,2030-01-01T10:00:00Z,,student2,student0;student1\n'
+            ',2030-01-01T10:00:00Z,,,\n'
+            'Full,2030-01-01T10:00:00Z,1,nobody,student0;student1\n'
+        )
+        response = self.client.post('/events/bulk/', body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3])
+        self.assertIn('title', response.data['errors'][0]['errors'])
+        self.assertIn('organizer', response.data['errors'][1]['errors'])
+        self.assertFalse(Event.objects.exists())
+
+        response = self.client.post('/events/bulk/?dry_run=1', body.rsplit('\n', 3)[0] + '\n', content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Event.objects.exists())
+
+    def test_export_round_trips_through_import_command(self):
+        self.client.post('/events/bulk/', self.rows(2), format='json')
+        response = self.client.get('/events/bulk/', {'output': 'csv'})
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('student0;student1', content)
+
+        Event.objects.all().delete()
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write(content)
+        self.addCleanup(os.remove, handle.name)
+        call_command('import_events', handle.name, stdout=StringIO())
+        self.assertEqual(Event.objects.count(), 2)
+        self.assertEqual(Event.objects.first().attendee_count, 2)
+
+    def test_bulk_is_admin_only(self):
+        self.client.force_authenticate(self.students[0])
+        self.assertEqual(self.client.post('/events/bulk/', [], format='json').status_code, status.HTTP_403_FORBIDDEN)
+
+
+class EventStatusFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        organizer = User.objects.create_user(username='org', password='pass')
+        now = timezone.now()
+        self.completed = Event.objects.create(title='Completed', description='Desc', organizer=organizer,
+                                              start_time=now - timedelta(days=3), end_time=now - timedelta(days=2))
+        self.ongoing = Event.objects.create(title='Ongoing', description='Desc', organizer=organizer,
+                                            start_time=now - timedelta(hours=1), end_time=now + timedelta(hours=1))
+        self.open_ended = Event.objects.create(title='Open ended', description='Desc', organizer=organizer,
+                                               start_time=now - timedelta(days=1))
+        self.upcoming = Event.objects.create(title='Upcoming', description='Desc', organizer=organizer,
+                                             start_time=now + timedelta(days=5))
+        self.later = Event.objects.create(title='Later', description='Desc', organizer=organizer,
+                                          start_time=now + timedelta(days=40))
+
+    def titles(self, **params):
+        response = self.client.get('/events/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [row['title'] for row in response.data]
+
+    def test_annotation_matches_python_property(self):
+        for event in Event.objects.with_status():
+            self.assertEqual(event.status, Event.objects.get(pk=event.pk).status)
+
+    def test_status_filter(self):
+        self.assertEqual(self.titles(status='ongoing'), ['Ongoing', 'Open ended'])
+        self.assertEqual(self.titles(status='completed'), ['Completed'])
+        self.assertEqual(self.titles(status='upcoming,completed'), ['Later', 'Upcoming', 'Completed'])
+        response = self.client.get('/events/', {'status': 'cancelled'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_status_is_computed_in_the_list_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get('/events/', {'status': 'ongoing'}).data
+        self.assertIn('CASE WHEN', queries[-1]['sql'])
+        self.assertEqual({row['status'] for row in rows}, {'ongoing'})
+
+    def test_status_ordering(self):
+        self.assertEqual(self.titles(ordering='status'), ['Ongoing', 'Open ended', 'Upcoming', 'Later', 'Completed'])
+
+    def test_status_ordering_is_paginated_by_cursor(self):
+        expected = ['Ongoing', 'Open ended', 'Upcoming', 'Later', 'Completed']
+        pages, url, params = [], '/events/', {'ordering': 'status', 'page_size': 2}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = json.loads(response.content)
+            pages.append([row['title'] for row in page['results']])
+            url, params = page['next'], None
+        self.assertEqual(pages, [expected[:2], expected[2:4], expected[4:]])
+
+        # and back again from the last page
+        response = self.client.get(page['previous'])
+        self.assertEqual([row['title'] for row in json.loads(response.content)['results']], expected[2:4])
+
+    def test_date_range(self):
+        today = timezone.localdate()
+        start = (today + timedelta(days=1)).isoformat()
+        self.assertEqual(self.titles(**{'from': start}), ['Later', 'Upcoming'])
+        self.assertEqual(self.titles(**{'from': start, 'to': (today + timedelta(days=5)).isoformat()}), ['Upcoming'])
+        self.assertEqual(self.titles(to=(today - timedelta(days=2)).isoformat()), ['Completed'])
+        response = self.client.get('/events/', {'from': 'next week'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
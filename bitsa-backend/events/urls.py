@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
@@ -9,3 +10,12 @@ router.register(r'', views.EventViewSet, basename='event')
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+if settings.ASYNC_VIEWS:
+    # async list/detail ahead of the router (see core.async_views); writes fall through to the sync view
+    urlpatterns[:0] = [
+        path('', views.EventViewSet.as_async_view({'get': 'list', 'post': 'create'}), name='event-list'),
+        path('<int:pk>/', views.EventViewSet.as_async_view({
+            'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+        }), name='event-detail'),
+    ]
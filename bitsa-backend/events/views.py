@@ -1,11 +1,24 @@
-from django.shortcuts import render
+import csv
+from datetime import datetime, time, timedelta
+
+from django.shortcuts import render, get_object_or_404
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Cast, Substr
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from core import search as core_search
+from core.async_views import AsyncReadMixin
+from core.conditional import ConditionalGetMixin
+from core.metrics import SerializationTimingMixin
+from core.response_cache import AnonymousResponseCacheMixin
+from core.serializers import EXCERPT_SOURCE_CHARS
+from . import bulk, exports
 from .models import Event
-from .serializers import EventSerializer
+from .serializers import EventSerializer, EventListSerializer
 from accounts.serializers import UserSerializer
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
@@ -22,9 +35,10 @@ class IsOrganizerOrAdmin(permissions.BasePermission):
         return obj.organizer == request.user or request.user.is_staff
 
 @method_decorator(csrf_exempt, name='dispatch')
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(AsyncReadMixin, AnonymousResponseCacheMixin, ConditionalGetMixin, SerializationTimingMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    cache_models = (Event,)
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -33,6 +47,8 @@ class EventViewSet(viewsets.ModelViewSet):
             return [permissions.IsAuthenticated()]
         elif self.action == 'my_events':
             return [permissions.IsAuthenticated()]
+        elif self.action in ['attendees', 'export_attendees', 'export_attendees_bulk', 'bulk']:
+            return [permissions.IsAdminUser()]
         return [permissions.IsAuthenticated(), IsOrganizerOrAdmin()]
 
     @action(detail=False, methods=['get'], url_path='my-events', permission_classes=[permissions.IsAuthenticated])
@@ -41,7 +57,7 @@ class EventViewSet(viewsets.ModelViewSet):
         List events the authenticated user has RSVP'd to.
         """
         user = request.user
-        events = Event.objects.filter(attendees=user).order_by('-start_time')
+        events = self.get_list_queryset().filter(attendees=user).order_by('-start_time')
         page = self.paginate_queryset(events)
         if page is not None:
             serializer = self.get_serializer(page, many=True, context={'request': request})
@@ -49,27 +65,113 @@ class EventViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(events, many=True, context={'request': request})
         return Response(serializer.data)
 
+    def etag_parts(self, instance):
+        # status follows the clock, not updated_at
+        return (instance.status,)
+
+    def list_summary_kwargs(self):
+        now = timezone.now()
+        return {
+            **super().list_summary_kwargs(),
+            **{f'{status}_count': models.Count('pk', filter=Event.objects.status_q(status, now)) for status in Event.STATUSES},
+        }
+
+    # ?ordering= values accepted by the list endpoint (prefix with '-' for descending);
+    # 'status' sorts by status_rank (ongoing, upcoming, completed)
+    ordering_fields = ('start_time', 'attendee_count', 'fill_level', 'status')
+
+    def get_list_queryset(self):
+        """
+        Base queryset for serializing many events at once: the organizer is
+        joined up front, attendee counts come from the denormalised column and
+        only the start of the description is loaded for the list excerpt.
+        ``status`` is computed by the database (see EventQuerySet).
+        """
+        return Event.objects.select_related('organizer').defer('description').annotate(
+            description_preview=Substr('description', 1, EXCERPT_SOURCE_CHARS)
+        ).with_status()
+
+    def get_serializer_class(self):
+        if self.action in ['list', 'my_events']:
+            return EventListSerializer
+        return EventSerializer
+
     def get_queryset(self):
-        qs = Event.objects.all()
+        if self.action == 'list':
+            qs = self.get_list_queryset()
+        else:
+            qs = Event.objects.select_related('organizer').with_status()
         # Visibility: all events for everyone (for viewing purposes)
 
         # Filters
         organizer = self.request.query_params.get('organizer')
         if organizer:
             qs = qs.filter(organizer__id=organizer)
-        search = self.request.query_params.get('search')
+        search = self.request.query_params.get('search', '').strip()
         if search:
-            qs = qs.filter(
-                models.Q(title__icontains=search) |
-                models.Q(description__icontains=search) |
-                models.Q(location__icontains=search)
-            )
+            qs = core_search.search(qs, search)
         upcoming = self.request.query_params.get('upcoming')
         if upcoming and upcoming.lower() in ['1', 'true', 'yes']:
             qs = qs.filter(start_time__gte=timezone.now())
+        statuses = [value.strip() for value in self.request.query_params.get('status', '').split(',') if value.strip()]
+        if statuses:
+            unknown = set(statuses) - set(Event.STATUSES)
+            if unknown:
+                raise ValidationError({'status': f"Must be one of: {', '.join(Event.STATUSES)}"})
+            qs = qs.filter_status(*statuses)
+        start_from, start_to = self._date_range_param('from'), self._date_range_param('to', end=True)
+        if start_from:
+            qs = qs.filter(start_time__gte=start_from)
+        if start_to:
+            qs = qs.filter(start_time__lt=start_to)
+        available = self.request.query_params.get('available')
+        if available and available.lower() in ['1', 'true', 'yes']:
+            qs = qs.filter(models.Q(capacity__isnull=True) | models.Q(attendee_count__lt=models.F('capacity')))
+
+        # Fill level: share of capacity taken, 0 for events without a capacity
+        qs = qs.annotate(fill_level=models.Case(
+            models.When(capacity__gt=0, then=Cast('attendee_count', models.FloatField()) / models.F('capacity')),
+            default=models.Value(0.0),
+            output_field=models.FloatField(),
+        ))
 
+        ordering = self.request.query_params.get('ordering', '')
+        if ordering.lstrip('-') in self.ordering_fields:
+            if ordering.lstrip('-') == 'status':
+                # upcoming events soonest first, everything else most recent first; the
+                # tie-breaker is annotated so keyset pagination can order and filter on it
+                qs = qs.annotate(status_sort_time=models.Case(
+                    models.When(status_rank=Event.STATUS_RANKS['upcoming'], then='start_time'),
+                    output_field=models.DateTimeField(),
+                ))
+                return qs.order_by(ordering.replace('status', 'status_rank'), 'status_sort_time', '-start_time')
+            return qs.order_by(ordering, '-start_time')
+        if search:
+            return qs.order_by('-search_rank', '-start_time')
         return qs.order_by('-start_time')
 
+    def _date_range_param(self, name, end=False):
+        """
+        ?from= / ?to= bound on start_time: an ISO date or datetime. A bare
+        ``to`` date includes that whole day; the upper bound is exclusive.
+        """
+        value = self.request.query_params.get(name, '').strip()
+        if not value:
+            return None
+        try:
+            # parse_datetime() also accepts bare dates, so try the date form first
+            day = parse_date(value)
+            moment = parse_datetime(value) if day is None else None
+        except ValueError:
+            day = moment = None
+        if day is not None:
+            moment = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+        elif moment is None:
+            raise ValidationError({name: 'Expected an ISO date (YYYY-MM-DD) or datetime.'})
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
     def perform_create(self, serializer):
         serializer.save(organizer=self.request.user)
 
@@ -79,34 +181,33 @@ class EventViewSet(viewsets.ModelViewSet):
         Toggle RSVP for the authenticated user.
         If capacity is set and full, return 400 when trying to join.
         Does NOT allow admin to RSVP.
+        Runs a fixed number of queries regardless of how many people attend.
         """
-        # Enhanced logging for debugging RSVP 403 issues
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.debug(f"RSVP called: user={request.user}, is_authenticated={request.user.is_authenticated}, is_staff={request.user.is_staff}, method={request.method}, path={request.path}")
-
         if not request.user.is_authenticated:
-            logger.warning(f"RSVP denied: unauthenticated access attempt. Headers: {dict(request.headers)}")
             return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
 
         if request.user.is_staff:
-            logger.info(f"RSVP forbidden for staff user: {request.user}")
             return Response({'error': 'Admins cannot confirm attendance.'}, status=status.HTTP_403_FORBIDDEN)
 
-        event = self.get_object()
         user = request.user
 
-        if user in event.attendees.all():
-            logger.debug(f"RSVP removing user {user} from attendees of event {event.id}")
-            event.attendees.remove(user)
-            return Response({'status': 'removed'}, status=status.HTTP_200_OK)
+        with transaction.atomic():
+            # Lock the event row so concurrent RSVPs for the same event are
+            # serialised and cannot both pass the capacity check.
+            event = get_object_or_404(
+                Event.objects.select_for_update().only('id', 'capacity', 'attendee_count'), pk=pk
+            )
+            self.check_object_permissions(request, event)
+
+            if Event.attendees.through.objects.filter(event_id=event.pk, user_id=user.pk).exists():
+                event.attendees.remove(user)
+                return Response({'status': 'removed'}, status=status.HTTP_200_OK)
 
-        if event.capacity is not None and event.attendees_count >= event.capacity:
-            logger.debug(f"RSVP attempt failed: event {event.id} is full")
-            return Response({'error': 'Event is full'}, status=status.HTTP_400_BAD_REQUEST)
+            # attendee_count is kept current by events.signals on every add/remove
+            if event.capacity is not None and event.attendee_count >= event.capacity:
+                return Response({'error': 'Event is full'}, status=status.HTTP_400_BAD_REQUEST)
 
-        logger.debug(f"RSVP adding user {user} to attendees of event {event.id}")
-        event.attendees.add(user)
+            event.attendees.add(user)
         return Response({'status': 'added'}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAdminUser])
@@ -119,6 +220,70 @@ class EventViewSet(viewsets.ModelViewSet):
         serializer = UserSerializer(attendees, many=True, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=['get'], url_path='attendees/export', permission_classes=[permissions.IsAdminUser])
+    def export_attendees(self, request, pk=None):
+        """
+        Stream the attendees of one event (admin-only).
+        GET /events/{id}/attendees/export/?output=csv|ndjson
+        """
+        event = self.get_object()
+        return self._attendee_export([event.pk], f"event-{event.pk}-attendees")
+
+    @action(detail=False, methods=['get'], url_path='export-attendees', permission_classes=[permissions.IsAdminUser])
+    def export_attendees_bulk(self, request):
+        """
+        Stream the attendees of several events (admin-only).
+        GET /events/export-attendees/?events=1,2,3&output=csv|ndjson
+        """
+        try:
+            event_ids = [int(pk) for pk in request.query_params.get('events', '').split(',') if pk.strip()]
+        except ValueError:
+            return Response({'error': 'events must be a comma-separated list of ids'}, status=status.HTTP_400_BAD_REQUEST)
+        if not event_ids:
+            return Response({'error': 'events is required'}, status=status.HTTP_400_BAD_REQUEST)
+        return self._attendee_export(event_ids, 'event-attendees')
+
+    def _attendee_export(self, event_ids, filename):
+        output = self.request.query_params.get('output', 'csv')
+        if output not in exports.CONTENT_TYPES:
+            return Response({'error': f"output must be one of: {', '.join(exports.CONTENT_TYPES)}"}, status=status.HTTP_400_BAD_REQUEST)
+        return exports.attendee_export_response(self.request, event_ids, output, filename)
+
+    @action(detail=False, methods=['get', 'post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Bulk import/export of events (admin-only, see events.bulk).
+        GET /events/bulk/?output=csv|json - export every event with its attendees
+        POST /events/bulk/[?dry_run=1] - import a text/csv body, a JSON list or a "file" upload;
+        nothing is saved unless every row is valid
+        """
+        if request.method == 'GET':
+            output = request.query_params.get('output', 'csv')
+            if output not in bulk.CONTENT_TYPES:
+                return Response({'error': f"output must be one of: {', '.join(bulk.CONTENT_TYPES)}"}, status=status.HTTP_400_BAD_REQUEST)
+            return bulk.event_export_response(request, Event.objects.all(), output)
+
+        try:
+            rows = self._bulk_import_rows(request)
+        except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true')
+        result = bulk.import_events(rows, request.user, dry_run=dry_run)
+        if result['errors']:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+    def _bulk_import_rows(self, request):
+        # text/csv has no DRF parser, so read the raw body before touching request.data
+        if request.content_type.startswith('text/csv'):
+            return bulk.parse(request.body.decode('utf-8-sig'), 'csv')
+        upload = request.FILES.get('file')
+        if upload is not None:
+            fmt = 'csv' if upload.name.lower().endswith('.csv') else 'json'
+            return bulk.parse(upload.read().decode('utf-8-sig'), fmt)
+        return bulk.parse(request.data, 'json')
+
     @action(detail=True, methods=['patch'])
     def publish(self, request, pk=None):
         """Admin-only: make an event public"""
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:13
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_uploaded_at(apps, schema_editor):
+    Photo = apps.get_model('gallery', 'Photo')
+    Photo.objects.update(updated_at=F('uploaded_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0002_photo_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photo',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(copy_uploaded_at, migrations.RunPython.noop),
+    ]
@@ -5,11 +5,16 @@ class Photo(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     image = models.ImageField(upload_to='gallery/')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of image (see core.images)")
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['-uploaded_at', '-id'], name='gallery_photo_uploaded_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -1,14 +1,16 @@
 from rest_framework import serializers
+from core.serializers import ImageSrcsetField, SparseFieldsMixin
 from .models import Photo
 
-class PhotoSerializer(serializers.ModelSerializer):
+class PhotoSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField()
 
     class Meta:
         model = Photo
-        fields = ['id', 'title', 'description', 'image', 'image_url', 'uploaded_by', 'uploaded_by_name', 'uploaded_at']
-        read_only_fields = ['uploaded_by', 'uploaded_at']
+        fields = ['id', 'title', 'description', 'image', 'image_url', 'image_srcset', 'uploaded_by', 'uploaded_by_name', 'uploaded_at', 'updated_at']
+        read_only_fields = ['uploaded_by', 'uploaded_at', 'updated_at']
 
     def get_image_url(self, obj):
         request = self.context.get('request')
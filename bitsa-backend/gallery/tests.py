@@ -1,3 +1,106 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from core.testing import QueryPlanAssertionsMixin
+from .models import Photo
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_jpeg(width=1600, height=1200):
+    exif = Image.Exif()
+    exif[0x010F] = 'PhoneMaker'  # Make
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), (200, 30, 30)).save(buffer, 'JPEG', exif=exif)
+    return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_PIPELINE_SYNC=True, IMAGE_VARIANT_WIDTHS=(320, 640))
+class PhotoVariantTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create(username='uploader')
+
+    def test_upload_generates_stripped_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            photo = Photo.objects.create(title='Team', image=make_jpeg(), uploaded_by=self.user)
+        photo.refresh_from_db()
+
+        formats = photo.image_variants['formats']
+        self.assertEqual(photo.image_variants['source'], photo.image.name)
+        self.assertEqual(set(formats), {'webp', 'jpeg'})
+        self.assertEqual(set(formats['webp']), {'320', '640'})
+        with default_storage.open(formats['jpeg']['320']) as fh:
+            variant = Image.open(fh)
+            self.assertEqual(variant.width, 320)
+            self.assertEqual(len(variant.getexif()), 0)
+
+    def test_small_images_get_a_single_variant(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            photo = Photo.objects.create(title='Icon', image=make_jpeg(200, 100), uploaded_by=self.user)
+        photo.refresh_from_db()
+        self.assertEqual(set(photo.image_variants['formats']['webp']), {'200'})
+
+    def test_serializer_exposes_srcset(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Photo.objects.create(title='Team', image=make_jpeg(), uploaded_by=self.user)
+
+        response = APIClient().get('/gallery/photos/')
+        srcset = response.data[0]['image_srcset']
+        self.assertRegex(srcset['webp'], r'^http://testserver/media/gallery/variants/photo-\w+-320w\.webp 320w, .+ 640w$')
+
+
+# Exercise the database-backed validators, not the anonymous response cache
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class PhotoConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(username='uploader')
+        self.photo = Photo.objects.create(title='Team', image='gallery/team.jpg', uploaded_by=self.user)
+
+    def test_list_returns_not_modified_until_data_changes(self):
+        response = self.client.get('/gallery/photos/')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/gallery/photos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Photo.objects.create(title='Second', image='gallery/second.jpg', uploaded_by=self.user)
+        response = self.client.get('/gallery/photos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+    def test_detail_uses_updated_at(self):
+        url = f'/gallery/photos/{self.photo.pk}/'
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.photo.title = 'Renamed'
+        self.photo.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_validators_depend_on_query_string(self):
+        etag = self.client.get('/gallery/photos/')['ETag']
+        response = self.client.get('/gallery/photos/', {'page_size': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class PhotoIndexTests(QueryPlanAssertionsMixin, TestCase):
+    def test_listing_uses_uploaded_at_index(self):
+        self.assertUsesIndex(Photo.objects.order_by('-uploaded_at', '-id'), 'gallery_photo_uploaded_idx')
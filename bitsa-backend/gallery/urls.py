@@ -1,7 +1,18 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.ASYNC_VIEWS:
+    # async reads (see core.async_views); uploads and edits go to the sync views
+    photo_list = views.PhotoListCreateView.as_async_view({'get': 'list', 'post': 'create'})
+    photo_detail = views.PhotoDetailView.as_async_view({
+        'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+    })
+else:
+    photo_list = views.PhotoListCreateView.as_view()
+    photo_detail = views.PhotoDetailView.as_view()
+
 urlpatterns = [
-    path('photos/', views.PhotoListCreateView.as_view(), name='photo-list-create'),
-    path('photos/<int:pk>/', views.PhotoDetailView.as_view(), name='photo-detail'),
+    path('photos/', photo_list, name='photo-list-create'),
+    path('photos/<int:pk>/', photo_detail, name='photo-detail'),
 ]
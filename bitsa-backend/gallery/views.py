@@ -3,12 +3,17 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.contrib.auth.models import User
+from core.async_views import AsyncReadMixin
+from core.conditional import ConditionalGetMixin
+from core.metrics import SerializationTimingMixin
+from core.response_cache import AnonymousResponseCacheMixin
 from .models import Photo
 from .serializers import PhotoSerializer
 
-class PhotoListCreateView(generics.ListCreateAPIView):
-    queryset = Photo.objects.all()
+class PhotoListCreateView(AsyncReadMixin, AnonymousResponseCacheMixin, ConditionalGetMixin, SerializationTimingMixin, generics.ListCreateAPIView):
+    queryset = Photo.objects.select_related('uploaded_by')
     serializer_class = PhotoSerializer
+    cache_models = (Photo,)
     permission_classes = [AllowAny]  # Allow anyone to view photos
     parser_classes = [MultiPartParser, FormParser]
 
@@ -20,9 +25,10 @@ class PhotoListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(uploaded_by=self.request.user)
 
-class PhotoDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Photo.objects.all()
+class PhotoDetailView(AsyncReadMixin, AnonymousResponseCacheMixin, ConditionalGetMixin, SerializationTimingMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Photo.objects.select_related('uploaded_by')
     serializer_class = PhotoSerializer
+    cache_models = (Photo,)
     permission_classes = [AllowAny]
 
     def get_permissions(self):
@@ -184,6 +184,15 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   };
 
   const logout = () => {
+    // Revoke the refresh token server-side; the session is cleared locally either way
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (refreshToken) {
+      fetch(`${API_BASE_URL}/auth/logout/`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ refresh: refreshToken }),
+      }).catch(() => undefined);
+    }
     setAuthState({
       user: null,
       isAuthenticated: false,